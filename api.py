@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import asyncio
+import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -12,14 +16,99 @@ NLP_CLIN_DIR = ROOT_DIR / "nlp_clin"
 if str(NLP_CLIN_DIR) not in sys.path:
     sys.path.insert(0, str(NLP_CLIN_DIR))
 
-from src.run_pipeline_debug import run_pipeline_debug  # noqa: E402
+from src.run_pipeline_debug import run_pipeline_debug_batch  # noqa: E402
+
+# Micro-batching knobs: single-text requests arriving within MAX_WAIT_MS of each
+# other are coalesced into one pipeline call of at most MAX_BATCH_SIZE texts.
+MAX_BATCH_SIZE = int(os.getenv("PIPELINE_MAX_BATCH_SIZE", "16"))
+MAX_WAIT_MS = float(os.getenv("PIPELINE_MAX_WAIT_MS", "50"))
+# Text run once at startup so lexicons, the spaCy model and compiled patterns
+# are loaded before the first request. Set WARMUP_TEXT="" to skip.
+WARMUP_TEXT = os.getenv("WARMUP_TEXT", "Paciente com cefaleia e febre, nega dor toracica.")
 
 
 class PipelineInput(BaseModel):
     text: str
 
 
-app = FastAPI(title="Clinical NLP Debug API")
+class PipelineBatchInput(BaseModel):
+    texts: List[str]
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-text requests into batched pipeline calls."""
+
+    def __init__(self, max_batch_size: int, max_wait_ms: float):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: Optional[asyncio.Queue[Tuple[str, asyncio.Future]]] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def submit(self, text: str) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        # Collector is started lazily and bound to the loop serving requests.
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._collect(self._queue))
+        future = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _collect(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, run_pipeline_debug_batch, texts)
+            except Exception as exc:  # noqa: BLE001 - surfaced per request
+                if len(batch) == 1:
+                    _, future = batch[0]
+                    if not future.done():
+                        future.set_exception(exc)
+                    continue
+                # Rerun one text at a time so a bad input only fails its own request
+                for item in batch:
+                    await self._run_single(loop, item)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    @staticmethod
+    async def _run_single(loop: asyncio.AbstractEventLoop, item: Tuple[str, asyncio.Future]) -> None:
+        text, future = item
+        try:
+            [result] = await loop.run_in_executor(None, run_pipeline_debug_batch, [text])
+        except Exception as exc:  # noqa: BLE001 - surfaced per request
+            if not future.done():
+                future.set_exception(exc)
+            return
+        if not future.done():
+            future.set_result(result)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    if WARMUP_TEXT:
+        await asyncio.to_thread(run_pipeline_debug_batch, [WARMUP_TEXT])
+    yield
+
+
+app = FastAPI(title="Clinical NLP Debug API", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -28,10 +117,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+_batcher = MicroBatcher(MAX_BATCH_SIZE, MAX_WAIT_MS)
+
 
 @app.post("/pipeline/debug")
-def pipeline_debug(payload: PipelineInput) -> dict:
+async def pipeline_debug(payload: PipelineInput) -> dict:
     try:
-        return run_pipeline_debug(payload.text)
+        return await _batcher.submit(payload.text)
     except Exception as exc:  # pragma: no cover - minimal debug endpoint
         raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@app.post("/pipeline/debug/batch")
+async def pipeline_debug_batch(payload: PipelineBatchInput) -> List[dict]:
+    try:
+        return await asyncio.to_thread(run_pipeline_debug_batch, payload.texts)
+    except Exception as exc:  # pragma: no cover - minimal debug endpoint
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+if __name__ == "__main__":
+    # The pipeline is CPU-bound Python, so throughput scales with worker
+    # processes rather than threads. Equivalent to:
+    #   uvicorn api:app --workers $(nproc) --limit-concurrency 64
+    import uvicorn
+
+    uvicorn.run(
+        "api:app",
+        host=os.getenv("API_HOST", "127.0.0.1"),
+        port=int(os.getenv("API_PORT", "8000")),
+        workers=int(os.getenv("API_WORKERS", str(os.cpu_count() or 1))),
+        limit_concurrency=int(os.getenv("API_LIMIT_CONCURRENCY", "64")),
+    )
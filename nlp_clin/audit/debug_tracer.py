@@ -2,7 +2,10 @@
 Debug tracer for tracking entities through the pipeline.
 """
 from __future__ import annotations
-from dataclasses import dataclass, asdict
+import sys
+from array import array
+from collections import Counter
+from dataclasses import dataclass, fields
 from typing import List, Dict, Any, Optional
 from enum import Enum
 
@@ -22,7 +25,7 @@ class EntityStatus(Enum):
     DUPLICATE = "duplicate"
 
 
-@dataclass
+@dataclass(slots=True)
 class EntityTrace:
     """Trace record for a single entity candidate."""
     span: str
@@ -38,101 +41,157 @@ class EntityTrace:
     evidence: Optional[str] = None
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        # All fields are scalars, so skip asdict's recursive deepcopy
+        return {
+            "span": self.span,
+            "start": self.start,
+            "end": self.end,
+            "entity_type": self.entity_type,
+            "source_lexicon": self.source_lexicon,
+            "match_strategy": self.match_strategy,
+            "raw_score": self.raw_score,
+            "status": self.status,
+            "discard_reason": self.discard_reason,
+            "assertion": self.assertion,
+            "evidence": self.evidence,
+        }
+
+
+_TRACE_FIELDS = tuple(f.name for f in fields(EntityTrace))
+
+# Status strings resolved once instead of through the enum on every call
+_CANDIDATE = EntityStatus.CANDIDATE.value
+_KEPT = EntityStatus.KEPT.value
+_FILTERED = EntityStatus.FILTERED.value
+_OVERLAP_REMOVED = EntityStatus.OVERLAP_REMOVED.value
+_DUPLICATE = EntityStatus.DUPLICATE.value
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern low-cardinality labels so all traces share one string object."""
+    return sys.intern(value) if value is not None else None
 
 
 class PipelineTracer:
-    """Tracks entities through the pipeline."""
+    """
+    Tracks entities through the pipeline.
+    
+    Traces are stored column-wise (one list/array per EntityTrace field)
+    instead of one object per candidate; a trace is addressed by the index
+    returned from add_candidate.
+    """
     
     def __init__(self):
-        self.traces: List[EntityTrace] = []
+        self._reset()
+    
+    def _reset(self):
+        self._spans: List[str] = []
+        self._starts = array("i")
+        self._ends = array("i")
+        self._entity_types: List[str] = []
+        self._source_lexicons: List[Optional[str]] = []
+        self._match_strategies: List[Optional[str]] = []
+        self._raw_scores = array("d")
+        self._statuses: List[str] = []
+        self._discard_reasons: List[Optional[str]] = []
+        self._assertions: List[Optional[str]] = []
+        self._evidences: List[Optional[str]] = []
         self.stage_counts: Dict[str, int] = {}
     
+    def __len__(self) -> int:
+        return len(self._spans)
+    
     def add_candidate(self, span: str, start: int, end: int, entity_type: str,
                      source_lexicon: Optional[str] = None,
                      match_strategy: Optional[str] = None,
                      raw_score: float = 0.0,
-                     evidence: Optional[str] = None) -> EntityTrace:
-        """Add a candidate entity."""
-        trace = EntityTrace(
-            span=span,
-            start=start,
-            end=end,
-            entity_type=entity_type,
-            source_lexicon=source_lexicon,
-            match_strategy=match_strategy,
-            raw_score=raw_score,
-            status=EntityStatus.CANDIDATE.value,
-            evidence=evidence
-        )
-        self.traces.append(trace)
-        return trace
+                     evidence: Optional[str] = None) -> int:
+        """Add a candidate entity and return its trace index."""
+        self._spans.append(span)
+        self._starts.append(start)
+        self._ends.append(end)
+        self._entity_types.append(_intern(entity_type))
+        self._source_lexicons.append(_intern(source_lexicon))
+        self._match_strategies.append(_intern(match_strategy))
+        self._raw_scores.append(raw_score)
+        self._statuses.append(_CANDIDATE)
+        self._discard_reasons.append(None)
+        self._assertions.append(None)
+        self._evidences.append(evidence)
+        return len(self._spans) - 1
     
-    def mark_kept(self, trace: EntityTrace, assertion: Optional[str] = None):
+    def mark_kept(self, index: int, assertion: Optional[str] = None):
         """Mark an entity as kept in final output."""
-        trace.status = EntityStatus.KEPT.value
-        trace.assertion = assertion
+        self._statuses[index] = _KEPT
+        self._assertions[index] = _intern(assertion)
     
-    def mark_filtered(self, trace: EntityTrace, reason: str):
+    def mark_filtered(self, index: int, reason: str):
         """Mark an entity as filtered out."""
-        trace.status = EntityStatus.FILTERED.value
-        trace.discard_reason = reason
+        self._statuses[index] = _FILTERED
+        self._discard_reasons[index] = _intern(reason)
     
-    def mark_overlap_removed(self, trace: EntityTrace, reason: str):
+    def mark_overlap_removed(self, index: int, reason: str):
         """Mark an entity as removed due to overlap."""
-        trace.status = EntityStatus.OVERLAP_REMOVED.value
-        trace.discard_reason = reason
+        self._statuses[index] = _OVERLAP_REMOVED
+        self._discard_reasons[index] = _intern(reason)
     
-    def mark_duplicate(self, trace: EntityTrace):
+    def mark_duplicate(self, index: int):
         """Mark an entity as duplicate."""
-        trace.status = EntityStatus.DUPLICATE.value
-        trace.discard_reason = "exact duplicate (same start/end/type)"
+        self._statuses[index] = _DUPLICATE
+        self._discard_reasons[index] = "exact duplicate (same start/end/type)"
+    
+    def get_trace(self, index: int) -> EntityTrace:
+        """Materialize a single trace record."""
+        return EntityTrace(
+            span=self._spans[index],
+            start=self._starts[index],
+            end=self._ends[index],
+            entity_type=self._entity_types[index],
+            source_lexicon=self._source_lexicons[index],
+            match_strategy=self._match_strategies[index],
+            raw_score=self._raw_scores[index],
+            status=self._statuses[index],
+            discard_reason=self._discard_reasons[index],
+            assertion=self._assertions[index],
+            evidence=self._evidences[index],
+        )
+    
+    @property
+    def traces(self) -> List[EntityTrace]:
+        """All traces as EntityTrace records (built on demand)."""
+        return [self.get_trace(i) for i in range(len(self))]
+    
+    def _reasons_for(self, status: str) -> Counter:
+        return Counter(
+            reason
+            for st, reason in zip(self._statuses, self._discard_reasons)
+            if st == status and reason
+        )
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about traced entities."""
-        stats = {
-            "total_candidates": len(self.traces),
-            "by_status": {},
-            "by_entity_type": {},
-            "by_source_lexicon": {},
-            "by_match_strategy": {},
-            "filter_reasons": {},
-            "overlap_reasons": {}
+        return {
+            "total_candidates": len(self),
+            "by_status": dict(Counter(self._statuses)),
+            "by_entity_type": dict(Counter(self._entity_types)),
+            "by_source_lexicon": dict(Counter(s or "unknown" for s in self._source_lexicons)),
+            "by_match_strategy": dict(Counter(s or "unknown" for s in self._match_strategies)),
+            "filter_reasons": dict(self._reasons_for(_FILTERED)),
+            "overlap_reasons": dict(self._reasons_for(_OVERLAP_REMOVED)),
         }
-        
-        for trace in self.traces:
-            # By status
-            stats["by_status"][trace.status] = stats["by_status"].get(trace.status, 0) + 1
-            
-            # By entity type
-            stats["by_entity_type"][trace.entity_type] = stats["by_entity_type"].get(trace.entity_type, 0) + 1
-            
-            # By source lexicon
-            source = trace.source_lexicon or "unknown"
-            stats["by_source_lexicon"][source] = stats["by_source_lexicon"].get(source, 0) + 1
-            
-            # By match strategy
-            strategy = trace.match_strategy or "unknown"
-            stats["by_match_strategy"][strategy] = stats["by_match_strategy"].get(strategy, 0) + 1
-            
-            # Filter reasons
-            if trace.status == EntityStatus.FILTERED.value and trace.discard_reason:
-                stats["filter_reasons"][trace.discard_reason] = stats["filter_reasons"].get(trace.discard_reason, 0) + 1
-            
-            # Overlap reasons
-            if trace.status == EntityStatus.OVERLAP_REMOVED.value and trace.discard_reason:
-                stats["overlap_reasons"][trace.discard_reason] = stats["overlap_reasons"].get(trace.discard_reason, 0) + 1
-        
-        return stats
     
     def to_dict_list(self) -> List[dict]:
         """Convert all traces to list of dicts."""
-        return [trace.to_dict() for trace in self.traces]
+        columns = (
+            self._spans, self._starts, self._ends, self._entity_types,
+            self._source_lexicons, self._match_strategies, self._raw_scores,
+            self._statuses, self._discard_reasons, self._assertions, self._evidences,
+        )
+        return [dict(zip(_TRACE_FIELDS, row)) for row in zip(*columns)]
     
     def clear(self):
         """Clear all traces."""
-        self.traces = []
-        self.stage_counts = {}
+        self._reset()
 
 
 # Global tracer instance
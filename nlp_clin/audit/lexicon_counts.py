@@ -3,16 +3,36 @@ Generate LEXICON_COUNTS.json with detailed lexicon loading statistics.
 """
 from __future__ import annotations
 import json
+from functools import lru_cache
 from pathlib import Path
 from collections import defaultdict
 
+try:
+    import orjson
+except ImportError:
+    # Fallback to stdlib json if orjson is not installed
+    orjson = None
+
 try:
     from unidecode import unidecode
+    _HAS_UNIDECODE = True
 except ImportError:
     # Fallback if unidecode is not installed
+    _HAS_UNIDECODE = False
+
     def unidecode(s: str) -> str:
         return s.encode("ascii", "ignore").decode("ascii")
 
+# PT-BR diacritics folded to ASCII in a single str.translate pass.
+_DIACRITIC_TABLE = str.maketrans(
+    "áàâãäéèêëíìîïóòôõöúùûüçñÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑ",
+    "aaaaaeeeeiiiiooooouuuucnAAAAAEEEEIIIIOOOOOUUUUCN",
+)
+if _HAS_UNIDECODE:
+    # Precompute unidecode for Latin-1 Supplement and Latin Extended-A so
+    # every Latin letter the lexicons use folds in the same translate pass.
+    _DIACRITIC_TABLE.update({cp: unidecode(chr(cp)) for cp in range(0x80, 0x180)})
+
 LEXICON_FILES = [
     ("symptoms_core_ptbr.txt", "SYMPTOM", 1),
     ("symptoms_expanded_ptbr.txt", "SYMPTOM", 2),
@@ -28,18 +48,18 @@ def load_lexicon_file(filepath: Path) -> list[str]:
     if not filepath.exists():
         return []
     
-    terms = []
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            term = line.strip()
-            if term:
-                terms.append(term)
-    return terms
+    lines = filepath.read_text(encoding='utf-8').splitlines()
+    return [term for term in map(str.strip, lines) if term]
 
 
+@lru_cache(maxsize=None)
 def normalize_for_dedup(term: str) -> str:
     """Normalize term for duplicate detection."""
-    return unidecode(term.lower().strip())
+    normalized = term.lower().strip().translate(_DIACRITIC_TABLE)
+    if normalized.isascii():
+        return normalized
+    # Rare codepoints outside the table still go through unidecode
+    return unidecode(normalized)
 
 
 def generate_lexicon_counts(lexicon_dir: Path) -> dict:
@@ -51,14 +71,17 @@ def generate_lexicon_counts(lexicon_dir: Path) -> dict:
         "summary": {}
     }
     
-    # Load all files
-    all_entries_by_file = {}
-    all_entries_normalized = {}
-    
+    # Load all files. last_source maps each normalized term to the
+    # (priority, filename) of the last file, in LEXICON_FILES order, that
+    # contains it; duplicates are compared against it below.
+    terms_by_file = {}
+    last_source: dict[str, tuple[int, str]] = {}
+
     for filename, entity_type, priority in LEXICON_FILES:
         filepath = lexicon_dir / filename
         terms = load_lexicon_file(filepath)
-        
+        terms_by_file[filename] = terms
+
         # File-level stats
         results["files"][filename] = {
             "path": str(filepath),
@@ -69,55 +92,35 @@ def generate_lexicon_counts(lexicon_dir: Path) -> dict:
             "unique_in_file": len(set(terms)),
             "sample_entries": terms[:5] if terms else []
         }
-        
-        all_entries_by_file[filename] = terms
-        
-        # Track normalized terms for deduplication
-        normalized_terms = {}
+
         for term in terms:
-            norm = normalize_for_dedup(term)
-            if norm not in normalized_terms:
-                normalized_terms[norm] = term  # Keep original
-            all_entries_normalized[norm] = {
-                "original": term,
-                "source_file": filename,
-                "entity_type": entity_type,
-                "priority": priority
-            }
-    
+            last_source[normalize_for_dedup(term)] = (priority, filename)
+
     # Simulate loading with priority (core symptoms first)
-    loaded_entries = []
-    seen_normalized = set()
+    seen = set()
     loaded_by_file = defaultdict(list)
+    loaded_by_type = defaultdict(int)
     dedup_stats = defaultdict(lambda: {"kept": 0, "skipped": 0})
-    
-    # Sort by priority
-    sorted_files = sorted(LEXICON_FILES, key=lambda x: x[2])
-    
-    for filename, entity_type, priority in sorted_files:
-        terms = all_entries_by_file.get(filename, [])
-        for term in terms:
+
+    for filename, entity_type, priority in sorted(LEXICON_FILES, key=lambda x: x[2]):
+        for term in terms_by_file[filename]:
             norm = normalize_for_dedup(term)
-            if norm not in seen_normalized:
-                seen_normalized.add(norm)
-                loaded_entries.append((term, entity_type))
+            if norm not in seen:
+                seen.add(norm)
                 loaded_by_file[filename].append(term)
+                loaded_by_type[entity_type] += 1
                 dedup_stats[filename]["kept"] += 1
+                continue
+            last_priority, last_file = last_source[norm]
+            if priority < last_priority:
+                # A repeat whose term a lower-priority file also has counts
+                # as kept here and skipped there
+                dedup_stats[filename]["kept"] += 1
+                dedup_stats[last_file]["skipped"] += 1
             else:
-                # Check if we're overriding a lower priority entry
-                existing = all_entries_normalized[norm]
-                if priority < existing["priority"]:
-                    # This shouldn't happen in our priority order, but log it
-                    dedup_stats[filename]["kept"] += 1
-                    dedup_stats[existing["source_file"]]["skipped"] += 1
-                else:
-                    dedup_stats[filename]["skipped"] += 1
-    
+                dedup_stats[filename]["skipped"] += 1
+
     # Generate loaded stats
-    loaded_by_type = defaultdict(int)
-    for term, etype in loaded_entries:
-        loaded_by_type[etype] += 1
-    
     for filename, entity_type, priority in LEXICON_FILES:
         results["loaded"][filename] = {
             "entity_type": entity_type,
@@ -126,15 +129,17 @@ def generate_lexicon_counts(lexicon_dir: Path) -> dict:
         }
     
     # Deduplication stats
-    for filename in all_entries_by_file:
+    for filename, _, _ in LEXICON_FILES:
         results["deduplication"][filename] = dedup_stats[filename]
     
     # Summary
+    total_raw = sum(len(terms) for terms in terms_by_file.values())
+    total_loaded = len(seen)
     results["summary"] = {
         "total_files": len(LEXICON_FILES),
-        "total_raw_entries": sum(len(terms) for terms in all_entries_by_file.values()),
-        "total_loaded_entries": len(loaded_entries),
-        "deduplication_rate": 1.0 - (len(loaded_entries) / sum(len(terms) for terms in all_entries_by_file.values())) if sum(len(terms) for terms in all_entries_by_file.values()) > 0 else 0.0,
+        "total_raw_entries": total_raw,
+        "total_loaded_entries": total_loaded,
+        "deduplication_rate": 1.0 - (total_loaded / total_raw) if total_raw > 0 else 0.0,
         "entries_by_type": dict(loaded_by_type),
         "files_by_type": {}
     }
@@ -157,8 +162,11 @@ if __name__ == "__main__":
     
     # Save to JSON
     output_path = script_dir / "LEXICON_COUNTS.json"
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(counts, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(counts, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(counts, f, indent=2, ensure_ascii=False)
     
     print(f"Generated {output_path}")
     print(f"\nSummary:")
@@ -2,10 +2,17 @@ from __future__ import annotations
 
 import argparse
 import difflib
+from bisect import bisect_left, bisect_right
 import re
 import sys
+from collections import Counter
 from pathlib import Path
 
+try:
+    from rapidfuzz.distance import Levenshtein
+except ImportError:  # pragma: no cover - fall back to difflib
+    Levenshtein = None
+
 
 THIS_FILE = Path(__file__).resolve()
 NLP_CLIN_DIR = THIS_FILE.parents[1]
@@ -32,37 +39,99 @@ def _resolve_data_path() -> Path:
     return NLP_CLIN_DIR / "data" / "raw" / "pepv1.json"
 
 
+_STATS_RE = re.compile(r"\n|  ")
+
+
 def _text_stats(text: str) -> dict:
+    # One scan collects both newlines and double spaces (non-overlapping,
+    # same as str.count).
+    counts = Counter(_STATS_RE.findall(text))
     return {
         "len": len(text),
-        "newlines": text.count("\n"),
-        "double_spaces": text.count("  "),
+        "newlines": counts["\n"],
+        "double_spaces": counts["  "],
     }
 
 
+_NL_ESCAPE = str.maketrans({"\n": "\\n"})
+
+
 def _preview(text: str, limit: int) -> str:
-    return text[:limit].replace("\n", "\\n")
+    return text[:limit].translate(_NL_ESCAPE)
+
+
+def _diff_opcodes(raw: str, clean: str):
+    if Levenshtein is not None:
+        return (tuple(op) for op in Levenshtein.opcodes(raw, clean))
+    return difflib.SequenceMatcher(None, raw, clean).get_opcodes()
+
+
+def _common_prefix_len(a: str, b: str) -> int:
+    # Binary search on slice equality keeps the character compares in C.
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_len(a: str, b: str, limit: int) -> int:
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
 
 
 def _diff_spans(raw: str, clean: str, max_spans: int = 3):
-    matcher = difflib.SequenceMatcher(None, raw, clean)
+    if raw == clean:
+        return []
+    # Preprocessing usually leaves most of the text untouched: diff only the
+    # region between the common prefix and suffix, then shift back.
+    prefix = _common_prefix_len(raw, clean)
+    suffix = _common_suffix_len(raw, clean, min(len(raw), len(clean)) - prefix)
+    raw_mid = raw[prefix:len(raw) - suffix]
+    clean_mid = clean[prefix:len(clean) - suffix]
+
     spans = []
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in _diff_opcodes(raw_mid, clean_mid):
         if tag == "equal":
             continue
-        spans.append((tag, i1, i2, j1, j2))
+        spans.append((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix))
         if len(spans) >= max_spans:
             break
     return spans
 
 
 def _snippet(text: str, start: int, end: int, max_len: int = 80) -> str:
-    snippet = text[start:end].replace("\n", "\\n")
+    # Escaping only grows the text, so max_len + 1 source chars decide both
+    # the truncation and the visible prefix.
+    snippet = text[start:min(end, start + max_len + 1)].translate(_NL_ESCAPE)
     if len(snippet) > max_len:
         snippet = snippet[:max_len] + "..."
     return snippet
 
 
+def _entities_by_sentence(sentences, entities):
+    """Yield, per sentence, the entities fully contained in it.
+
+    Entities are sorted by start once; each sentence then bisects to the
+    entities starting inside it instead of rescanning the whole list.
+    """
+    ordered = sorted(entities, key=lambda e: e.start)
+    starts = [e.start for e in ordered]
+    for sent in sentences:
+        lo = bisect_left(starts, sent.start)
+        hi = bisect_right(starts, sent.end)
+        yield [e for e in ordered[lo:hi] if e.end <= sent.end]
+
+
 def _select_doc(docs, case_id: int | None, doc_id: str | None):
     if doc_id:
         for doc in docs:
@@ -79,19 +148,22 @@ def _select_doc(docs, case_id: int | None, doc_id: str | None):
     return docs[0] if docs else None
 
 
+_KNOWN_SOURCES = frozenset(("pattern", "lexicon", "index", "fuzzy", "unknown"))
+_DIGIT_RE = re.compile(r"\d")
+_UNIT_RE = re.compile(r"[x/]|bpm|mmhg|spo2|sat")
+_SCORE_RE = re.compile(r"glasgow|gcs|ecg|fast")
+
+
 def _infer_source(span: str, ent) -> str:
-    allowed = {"pattern", "lexicon", "index", "fuzzy", "unknown"}
     for attr in ("source", "reason"):
         value = getattr(ent, attr, None)
         if isinstance(value, str) and value:
             normalized = value.lower().strip()
-            return normalized if normalized in allowed else "unknown"
+            return normalized if normalized in _KNOWN_SOURCES else "unknown"
     s = span.lower()
-    if re.search(r"\d", s) and (
-        "x" in s or "/" in s or "bpm" in s or "mmhg" in s or "spo2" in s or "sat" in s
-    ):
+    if _DIGIT_RE.search(s) and _UNIT_RE.search(s):
         return "pattern"
-    if any(tok in s for tok in ("glasgow", "gcs", "ecg", "fast")):
+    if _SCORE_RE.search(s):
         return "pattern"
     return "unknown"
 
@@ -162,11 +234,9 @@ def main() -> int:
 
     # 4) BASELINE_NER
     print("BASELINE_NER")
-    for idx, sent in enumerate(sentences[: args.n_sent]):
+    shown = sentences[: args.n_sent]
+    for idx, (sent, sent_entities) in enumerate(zip(shown, _entities_by_sentence(shown, entities))):
         print(f"SENT {idx:02d} [{sent.start}:{sent.end}] {_one_line(sent.text)}")
-        sent_entities = [
-            e for e in entities if e.start >= sent.start and e.end <= sent.end
-        ]
         if not sent_entities:
             continue
         for e in sent_entities:
@@ -20,8 +20,11 @@ def _resolve_data_path() -> Path:
     return base_dir / "data" / "raw" / "pepv1.json"
 
 
+_NL_ESCAPE = str.maketrans({"\n": "\\n"})
+
+
 def _preview(text: str, limit: int = 400) -> str:
-    return text[:limit].replace("\n", "\\n")
+    return text[:limit].translate(_NL_ESCAPE)
 
 
 def _select_docs(docs, case_id: int | None, doc_id: str | None, n: int):
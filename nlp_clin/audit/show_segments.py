@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import os
 import sys
 from pathlib import Path
 
@@ -13,7 +14,11 @@ if str(NLP_CLIN_DIR) not in sys.path:
 
 from src.ingest_json import load_json_cases
 from src.preprocess import normalize_text
-from src.segment import split_sentences
+from src.segment import split_sentences_batch
+
+# Documents are segmented together through spaCy's nlp.pipe
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "32"))
+AUDIT_N_PROCESS = int(os.getenv("AUDIT_N_PROCESS", "1"))
 
 
 def _resolve_data_path() -> Path:
@@ -55,10 +60,12 @@ def main() -> int:
     if not selected_docs:
         return 1
 
-    for doc in selected_docs:
-        clean_text = normalize_text(doc.text)
-        sentences = split_sentences(clean_text)
+    clean_texts = [normalize_text(doc.text) for doc in selected_docs]
+    segmented = split_sentences_batch(
+        clean_texts, batch_size=AUDIT_BATCH_SIZE, n_process=AUDIT_N_PROCESS
+    )
 
+    for doc, sentences in zip(selected_docs, segmented):
         print("=" * 80)
         print(f"case_id: {doc.case_id} | group: {doc.group} | doc_id: {doc.doc_id}")
         for idx, sent in enumerate(sentences):
@@ -6,18 +6,83 @@ Usage:
 """
 import json
 import argparse
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Any
+
+try:
+    import orjson
+except ImportError:
+    # Fallback to stdlib json if orjson is not installed
+    orjson = None
+
+# Case files are small, so loading is bound by read syscalls rather than CPU;
+# a thread pool overlaps them (the GIL is released around file IO).
+READ_WORKERS = 32
+
+
+def _load_case(case_file: Path) -> Dict[str, Any]:
+    if orjson is not None:
+        return orjson.loads(case_file.read_bytes())
+    return json.loads(case_file.read_text(encoding="utf-8"))
+
+
+def _dump_case(case: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(case, option=orjson.OPT_INDENT_2)
+    return json.dumps(case, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def iter_case_files(cases_dir: Path, max_workers: int = READ_WORKERS) -> Iterator[Dict[str, Any]]:
+    """Yield case JSON objects from a directory, in file name order."""
+    case_files = sorted(cases_dir.glob("*.json"))
+    if not case_files:
+        return
+    workers = min(max_workers, len(case_files))
+    files = iter(case_files)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded window of reads in flight, so parsed cases never pile
+        # up ahead of the consumer; results are yielded in file order.
+        pending = deque(executor.submit(_load_case, f) for f in islice(files, 2 * workers))
+        while pending:
+            case = pending.popleft().result()
+            for f in islice(files, 1):
+                pending.append(executor.submit(_load_case, f))
+            yield case
 
 
 def combine_case_files(cases_dir: Path) -> List[Dict[str, Any]]:
     """Load all case JSON files from a directory."""
-    cases = []
-    for case_file in sorted(cases_dir.glob("*.json")):
-        with open(case_file, 'r', encoding='utf-8') as f:
-            case_data = json.load(f)
-            cases.append(case_data)
-    return cases
+    return list(iter_case_files(cases_dir))
+
+
+def write_combined(cases: Iterable[Dict[str, Any]], output_path: Path) -> int:
+    """
+    Stream cases to output_path as a single JSON array.
+
+    Each case is encoded and written as soon as it is read, so the combined
+    file is never held in memory. The array goes to a temporary file next to
+    output_path, which replaces it only once every case has been written, so
+    a failed read never leaves a truncated file. Returns the number of cases
+    written.
+    """
+    count = 0
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(b"[")
+            for case in cases:
+                f.write(b"\n" if count == 0 else b",\n")
+                f.write(_dump_case(case))
+                count += 1
+            f.write(b"\n]\n" if count else b"]\n")
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return count
 
 
 def main():
@@ -32,24 +97,21 @@ def main():
         type=str,
         help="Output JSON file path"
     )
-    
+
     args = parser.parse_args()
-    
+
     cases_dir = Path(args.cases_dir)
     output_path = Path(args.output)
-    
+
     print(f"Loading cases from {cases_dir}...")
-    cases = combine_case_files(cases_dir)
-    print(f"  Found {len(cases)} cases")
-    
+
     # Write combined file
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(cases, f, ensure_ascii=False, indent=2)
-    
+    count = write_combined(iter_case_files(cases_dir), output_path)
+    print(f"  Found {count} cases")
+
     print(f"Combined predictions saved to {output_path}")
 
 
 if __name__ == "__main__":
     main()
-
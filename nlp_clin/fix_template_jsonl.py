@@ -5,8 +5,61 @@ Usage (from nlp_clin/):
     python fix_template_jsonl.py
 """
 import json
+import mmap
+import os
+import re
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    # Fallback to stdlib json if orjson is not installed
+    orjson = None
+
+_WRAPPER_RE = re.compile(r'\s*"gold_entities"\s*:\s*\[')
+_SEPARATOR_RE = re.compile(r"[\s,]*")
+
+# Metadata keys every template line carries, added after any existing keys
+_DEFAULT_METADATA = {"annotator": "", "version": "v1"}
+
+
+def _iter_annotation_cases(text: str):
+    """
+    Yield case objects from the annotation template.
+
+    Each object is decoded in place with json's C scanner (raw_decode), so
+    braces inside strings are handled and missing commas between objects
+    don't matter. Plain JSONL input works as well.
+    """
+    decoder = json.JSONDecoder()
+    wrapper = _WRAPPER_RE.match(text)
+    idx = wrapper.end() if wrapper else 0
+    while True:
+        idx = _SEPARATOR_RE.match(text, idx).end()
+        if idx >= len(text) or text[idx] == "]":
+            return
+        try:
+            case, idx = decoder.raw_decode(text, idx)
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Failed to parse annotation block at char {idx}: {e}") from e
+        yield case
+
+
+def _load_json(path: Path):
+    """Parse a JSON file; with orjson, straight from a read-only memory map."""
+    if orjson is None:
+        return json.loads(path.read_text(encoding="utf-8"))
+    with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def _dumps_line(obj) -> bytes:
+    """Serialize obj as one compact UTF-8 JSON line (same bytes either way)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
 
 def main() -> None:
     root = Path(__file__).parent
@@ -14,7 +67,7 @@ def main() -> None:
     tmpl_path = root / "data" / "gold" / "template.jsonl"
 
     # Load raw cases (authoritative list of case_ids and texts)
-    raw_data = json.loads(raw_path.read_text(encoding="utf-8"))
+    raw_data = _load_json(raw_path)
 
     # Load existing annotations from current (non-JSONL) template.
     # The current file looks like:
@@ -24,44 +77,7 @@ def main() -> None:
     #       ...
     #   ]
     # but it's not valid JSON because there are no commas between case objects.
-    # We parse it manually into separate case JSON blocks.
-    raw_text = tmpl_path.read_text(encoding="utf-8")
-    lines = raw_text.splitlines()
-
-    case_blocks: list[str] = []
-    current_block: list[str] = []
-    in_case = False
-
-    for idx, line in enumerate(lines):
-        stripped = line.strip()
-
-        # Skip the top-level wrapper and closing bracket
-        if idx == 0 and stripped.startswith("\"gold_entities\""):
-            continue
-        if stripped == "]":
-            continue
-
-        # Detect start of a case object (line with just '{' at this level)
-        if not in_case and stripped.startswith("{"):
-            in_case = True
-            current_block = [line]
-            continue
-
-        if in_case:
-            current_block.append(line)
-            # End of case object (line with just '}')
-            if stripped == "}":
-                case_blocks.append("\n".join(current_block))
-                current_block = []
-                in_case = False
-
-    # Parse each case block as JSON
-    annot_cases = []
-    for block in case_blocks:
-        try:
-            annot_cases.append(json.loads(block))
-        except json.JSONDecodeError as e:
-            raise RuntimeError(f"Failed to parse annotation block:\n{block}\nError: {e}") from e
+    annot_cases = list(_iter_annotation_cases(tmpl_path.read_text(encoding="utf-8")))
 
     # Index annotations by case_id
     ann_by_case: dict[str, dict] = {}
@@ -71,30 +87,35 @@ def main() -> None:
             continue
         ann_by_case[cid] = case
 
-    lines: list[str] = []
-    for case in raw_data:
-        cid = str(case.get("case_id"))
-        group = case.get("group", "")
-        raw_text = case.get("raw_text") or ""
-
-        existing = ann_by_case.get(cid, {})
-        gold_entities = existing.get("gold_entities", [])
-        metadata = existing.get("metadata", {})
-        if "annotator" not in metadata:
-            metadata["annotator"] = ""
-        if "version" not in metadata:
-            metadata["version"] = "v1"
-
-        obj = {
-            "case_id": cid,
-            "group": group,
-            "raw_text": raw_text,
-            "gold_entities": gold_entities,
-            "metadata": metadata,
-        }
-        lines.append(json.dumps(obj, ensure_ascii=False))
-
-    tmpl_path.write_text("\n".join(lines), encoding="utf-8")
+    # Stream one JSON object per line instead of joining the whole corpus.
+    # The template is also the input, so write beside it and swap it in only
+    # once every line has been written.
+    tmp_path = tmpl_path.with_name(tmpl_path.name + ".tmp")
+    try:
+        with tmp_path.open("wb") as fh:
+            write = fh.write
+            for case in raw_data:
+                cid = str(case.get("case_id"))
+                group = case.get("group", "")
+                raw_text = case.get("raw_text") or ""
+
+                existing = ann_by_case.get(cid, {})
+                gold_entities = existing.get("gold_entities", [])
+                metadata = existing.get("metadata", {})
+                for key, value in _DEFAULT_METADATA.items():
+                    metadata.setdefault(key, value)
+
+                obj = {
+                    "case_id": cid,
+                    "group": group,
+                    "raw_text": raw_text,
+                    "gold_entities": gold_entities,
+                    "metadata": metadata,
+                }
+                write(_dumps_line(obj))
+        os.replace(tmp_path, tmpl_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
 
 if __name__ == "__main__":
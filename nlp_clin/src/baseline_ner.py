@@ -1,12 +1,17 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple
+from pathlib import Path
+from typing import Iterable, List, Tuple
+import os
 import re
-from rapidfuzz import fuzz
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from rapidfuzz import fuzz, process
+from unidecode import unidecode
 
 from src.lexicon import LEXICON
 from src.patterns import PATTERN_DEFS
-from src.search_index import LexiconIndex, MatchCandidate
+from src.search_index import MatchCandidate, load_or_build_index
 
 
 @dataclass
@@ -21,8 +26,11 @@ class EntitySpan:
     evidence: str
 
 
+# On-disk cache for the built index; set NLP_CLIN_CACHE_DIR="" to disable
+CACHE_DIR = os.getenv("NLP_CLIN_CACHE_DIR", str(Path(__file__).resolve().parent.parent / "data" / "cache"))
+
 # Initialize index once at module load
-_index = LexiconIndex(LEXICON)
+_index = load_or_build_index(LEXICON, CACHE_DIR)
 
 # Fuzzy matching is disabled for SYMPTOM to reduce false positives
 FUZZY_ENABLED_TYPES = {etype for _, etype in LEXICON if etype != "SYMPTOM"}
@@ -30,13 +38,49 @@ FUZZY_ENABLED_TYPES = {etype for _, etype in LEXICON if etype != "SYMPTOM"}
 
 def _normalize_for_match(s: str) -> str:
     """Normalize text for matching (same as LexiconIndex._normalize)."""
-    from unidecode import unidecode
     text = unidecode(s.lower())
     text = re.sub(r'\s+', ' ', text)
     text = re.sub(r'[^\w\s-]', '', text)
     return text.strip()
 
 
+@lru_cache(maxsize=None)
+def _fold_char(ch: str) -> str:
+    return unidecode(ch.lower())
+
+
+# Templated sentences recur across documents; offsets cost ~1KB per sentence
+@lru_cache(maxsize=4096)
+def _normalize_with_map(s: str) -> Tuple[str, Tuple[int, ...]]:
+    """
+    Normalize like _normalize_for_match, also returning for each character of
+    the result the index in s of the character it came from.
+    """
+    chars: List[str] = []
+    offsets: List[int] = []
+    in_space = False
+    for i, ch in enumerate(s):
+        for c in _fold_char(ch):
+            if c.isspace():
+                # Collapse whitespace runs into the first character
+                if not in_space:
+                    chars.append(" ")
+                    offsets.append(i)
+                    in_space = True
+                continue
+            in_space = False
+            # Drop punctuation
+            if c.isalnum() or c == "_" or c == "-":
+                chars.append(c)
+                offsets.append(i)
+    start, end = 0, len(chars)
+    while start < end and chars[start] == " ":
+        start += 1
+    while end > start and chars[end - 1] == " ":
+        end -= 1
+    return "".join(chars[start:end]), tuple(offsets[start:end])
+
+
 def _normalize_span(raw_text: str, start: int, end: int) -> tuple[int, int] | None:
     """
     Trim whitespace/punctuation and expand to full token boundaries.
@@ -79,60 +123,6 @@ def _normalize_span(raw_text: str, start: int, end: int) -> tuple[int, int] | No
 
     return start, end
 
-def _find_span_in_original(original_text: str, normalized_text: str, 
-                          normalized_pattern: str, start_offset: int = 0) -> Tuple[int, int] | None:
-    """
-    Find the span of a normalized pattern in the original text.
-    
-    Returns (start, end) in original text coordinates, or None if not found.
-    """
-    # Find in normalized text first
-    norm_idx = normalized_text.find(normalized_pattern)
-    if norm_idx == -1:
-        return None
-    
-    # Search in original text by normalizing windows
-    # This handles accents and punctuation differences
-    pattern_lower = normalized_pattern.lower()
-    pattern_len = len(normalized_pattern)
-    
-    # Search around the expected position with a sliding window
-    search_start = max(0, norm_idx - 10)
-    search_end = min(len(original_text), norm_idx + pattern_len + 20)
-    
-    best_match = None
-    best_score = 0
-    
-    for i in range(search_start, search_end):
-        # Try windows of different sizes around this position
-        for window_size in range(pattern_len - 2, pattern_len + 5):
-            if i + window_size > len(original_text):
-                continue
-            window = original_text[i:i+window_size]
-            window_norm = _normalize_for_match(window)
-            
-            # Check if normalized pattern matches
-            if pattern_lower in window_norm or window_norm in pattern_lower:
-                # Calculate a simple score (prefer exact length matches)
-                score = 1.0 if len(window) == pattern_len else 0.8
-                if score > best_score:
-                    best_score = score
-                    # Find the exact position within the window
-                    window_idx = window_norm.find(pattern_lower)
-                    if window_idx == -1:
-                        # Try reverse
-                        if pattern_lower.find(window_norm) != -1:
-                            window_idx = 0
-                    if window_idx != -1:
-                        best_match = (start_offset + i + window_idx, 
-                                     start_offset + i + window_idx + pattern_len)
-    
-    if best_match:
-        return best_match
-    
-    # Fallback: approximate position
-    return (start_offset + norm_idx, start_offset + norm_idx + pattern_len)
-
 
 def _resolve_overlaps(spans: List[EntitySpan]) -> List[EntitySpan]:
     """
@@ -233,7 +223,7 @@ def extract_entities_baseline(text: str, sentences: List[Tuple[str, int, int]],
     
     # 2) Lexicon-based matching using index
     for sent_text, ss, se in sentences:
-        sent_norm = _normalize_for_match(sent_text)
+        sent_norm, norm_offsets = _normalize_with_map(sent_text)
         sent_tokens = sent_norm.split()
         
         # Get candidates from index
@@ -242,12 +232,12 @@ def extract_entities_baseline(text: str, sentences: List[Tuple[str, int, int]],
         # Process exact and token matches
         for cand in candidates:
             if cand.match_type in ("exact", "token"):
-                # Find span in original text
-                span_info = _find_span_in_original(sent_text, sent_norm, cand.normalized_term, ss)
-                if span_info:
-                    start, end = span_info
+                score = 0.99 if cand.match_type == "exact" else 0.95
+                for norm_start, norm_end in cand.spans:
+                    # Map the occurrence back to the original text
+                    start = ss + norm_offsets[norm_start]
+                    end = ss + norm_offsets[norm_end - 1] + 1
                     # Ensure we don't go beyond sentence bounds
-                    start = max(ss, start)
                     end = min(se, end)
 
                     norm = _normalize_span(text, start, end)
@@ -256,7 +246,6 @@ def extract_entities_baseline(text: str, sentences: List[Tuple[str, int, int]],
                     n_start, n_end = norm
 
                     if n_start < n_end:
-                        score = 0.99 if cand.match_type == "exact" else 0.95
                         results.append(EntitySpan(
                             span=text[n_start:n_end],
                             start=n_start,
@@ -276,7 +265,16 @@ def extract_entities_baseline(text: str, sentences: List[Tuple[str, int, int]],
             ]
             if not fuzzy_candidates:
                 continue
-            
+
+            # (start, end) of each token in sent_norm, for locating windows
+            token_spans = [m.span() for m in re.finditer(r'\S+', sent_norm)]
+            # Sentence n-grams, built once per arity
+            windows_by_n: dict[int, List[str]] = {}
+
+            # Candidates are scored one at a time rather than as a single
+            # process.cdist matrix: cdist saved no time over one rapidfuzz
+            # call per candidate on pepv1 (few candidates per sentence, most
+            # pairs below min_fuzzy) and it reports float32 scores.
             for cand in fuzzy_candidates:
                 # Use rapidfuzz to find best match
                 # Compare against sentence substrings
@@ -287,26 +285,30 @@ def extract_entities_baseline(text: str, sentences: List[Tuple[str, int, int]],
                 # Try matching against sentence n-grams
                 n = len(cand.tokens)
                 if n > 0 and len(sent_tokens) >= n:
-                    for i in range(len(sent_tokens) - n + 1):
-                        window = " ".join(sent_tokens[i:i+n])
-                        score = fuzz.partial_ratio(cand.normalized_term, window)
-                        if score > best_score:
-                            best_score = score
-                            # Approximate position
-                            window_text = " ".join(sent_tokens[i:i+n])
-                            pos = sent_norm.find(window_text)
-                            if pos != -1:
-                                best_start = ss + pos
-                                best_end = min(se, best_start + len(window_text))
+                    windows = windows_by_n.get(n)
+                    if windows is None:
+                        windows = windows_by_n[n] = [
+                            " ".join(sent_tokens[i:i+n]) for i in range(len(sent_tokens) - n + 1)
+                        ]
+                    # First best-scoring window, or None if none reaches min_fuzzy
+                    hit = process.extractOne(
+                        cand.normalized_term, windows, scorer=fuzz.partial_ratio, score_cutoff=min_fuzzy
+                    )
+                    if hit is not None:
+                        _, best_score, i = hit
+                        best_start = ss + norm_offsets[token_spans[i][0]]
+                        best_end = min(se, ss + norm_offsets[token_spans[i + n - 1][1] - 1] + 1)
                 
                 # Also try whole sentence match
-                whole_score = fuzz.partial_ratio(cand.normalized_term, sent_norm)
-                if whole_score > best_score:
-                    best_score = whole_score
-                    # Find approximate position
-                    span_info = _find_span_in_original(sent_text, sent_norm, cand.normalized_term, ss)
-                    if span_info:
-                        best_start, best_end = span_info
+                alignment = fuzz.partial_ratio_alignment(
+                    cand.normalized_term, sent_norm, score_cutoff=max(min_fuzzy, best_score)
+                )
+                if alignment is not None and alignment.score > best_score:
+                    best_score = alignment.score
+                    # Map the aligned part of the sentence back to the original text
+                    if alignment.dest_end > alignment.dest_start:
+                        best_start = ss + norm_offsets[alignment.dest_start]
+                        best_end = min(se, ss + norm_offsets[alignment.dest_end - 1] + 1)
                 
                 if best_score >= min_fuzzy and best_start is not None and best_end is not None:
                     norm = _normalize_span(text, best_start, best_end)
@@ -336,3 +338,37 @@ def extract_entities_baseline(text: str, sentences: List[Tuple[str, int, int]],
     resolved = _resolve_overlaps(deduped)
     
     return sorted(resolved, key=lambda x: (x.start, -x.score))
+
+
+def _extract_doc(doc: Tuple[str, List[Tuple[str, int, int]]], **kwargs) -> List[EntitySpan]:
+    """Run extract_entities_baseline on one (text, sentences) pair."""
+    text, sentences = doc
+    return extract_entities_baseline(text, sentences, **kwargs)
+
+
+def batch_extract_baseline(texts: Iterable[str], sentences: Iterable[List[Tuple[str, int, int]]],
+                           workers: int | None = None, chunksize: int = 8,
+                           **kwargs) -> List[List[EntitySpan]]:
+    """
+    Extract entities from many documents, spread over worker processes.
+
+    Each worker gets its own index from the module-level load (inherited on
+    fork, rebuilt from the on-disk cache otherwise), so nothing large is
+    pickled per task.
+
+    Args:
+        texts: Document texts
+        sentences: Sentence tuples for each document, as for extract_entities_baseline
+        workers: Number of processes (None: one per CPU, 1: run serially)
+        chunksize: Documents sent to a worker at a time
+        **kwargs: Passed to extract_entities_baseline (min_fuzzy, enable_fuzzy)
+
+    Returns:
+        One list of EntitySpan per document, in input order
+    """
+    extract = partial(_extract_doc, **kwargs)
+    docs = zip(texts, sentences)
+    if workers == 1:
+        return list(map(extract, docs))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(extract, docs, chunksize=chunksize))
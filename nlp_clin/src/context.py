@@ -12,7 +12,7 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import List, Pattern, Tuple, Optional
+from typing import List, Pattern, Tuple
 
 
 # ----------------------------
@@ -61,21 +61,13 @@ def classify_assertion(sentence: str, ent_start: int, ent_end: int, ent_type: st
     # but we keep patterns generic in trigger sets.
 
     # 6) Evaluate triggers with precedence: NEG > POSS > HIST > PRESENT
-    # We pick the closest match to entity (highest index) for each category,
-    # then choose by precedence.
-    scores = {
-        ASSERTION_NEGATED: _best_trigger_pos(left, TRIGGERS.neg),
-        ASSERTION_POSSIBLE: _best_trigger_pos(left, TRIGGERS.possible),
-        ASSERTION_HISTORICAL: _best_trigger_pos(left, TRIGGERS.hist),
-    }
-
-    # If any trigger matched, return by precedence (not by closeness across categories),
-    # but only if matched at all.
-    if scores[ASSERTION_NEGATED] is not None:
+    # Precedence is by category, not by closeness to the entity, so each
+    # category only needs to know whether any of its triggers matched.
+    if _has_trigger(left, TRIGGERS.neg):
         return ASSERTION_NEGATED
-    if scores[ASSERTION_POSSIBLE] is not None:
+    if _has_trigger(left, TRIGGERS.possible):
         return ASSERTION_POSSIBLE
-    if scores[ASSERTION_HISTORICAL] is not None:
+    if _has_trigger(left, TRIGGERS.hist):
         return ASSERTION_HISTORICAL
 
     return ASSERTION_PRESENT
@@ -93,15 +85,16 @@ class Config:
 CONFIG = Config()
 
 
-def _compile_many(patterns: List[str]) -> List[Pattern]:
-    return [re.compile(p, re.IGNORECASE) for p in patterns]
+def _compile_union(patterns: List[str]) -> Pattern:
+    # One alternation per category: a single scan instead of one per trigger
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
 
 
 @dataclass(frozen=True)
 class TriggerSets:
-    neg: List[Pattern]
-    possible: List[Pattern]
-    hist: List[Pattern]
+    neg: Pattern
+    possible: Pattern
+    hist: Pattern
 
 
 # Breakers (scope boundaries) in PT-BR clinical text
@@ -166,9 +159,9 @@ HIST_TRIGGERS = [
 ]
 
 TRIGGERS = TriggerSets(
-    neg=_compile_many(NEG_TRIGGERS),
-    possible=_compile_many(POSSIBLE_TRIGGERS),
-    hist=_compile_many(HIST_TRIGGERS),
+    neg=_compile_union(NEG_TRIGGERS),
+    possible=_compile_union(POSSIBLE_TRIGGERS),
+    hist=_compile_union(HIST_TRIGGERS),
 )
 
 
@@ -177,10 +170,9 @@ TRIGGERS = TriggerSets(
 # ----------------------------
 
 def _norm(s: str) -> str:
-    # Keep it simple: lowercase + collapse whitespace
-    s = s.lower()
-    s = re.sub(r"\s+", " ", s)
-    return s.strip()
+    # Keep it simple: lowercase + collapse whitespace (split() drops the
+    # same Unicode whitespace as \s, without a regex pass)
+    return " ".join(s.lower().split())
 
 
 def _norm_type(t: str) -> str:
@@ -199,19 +191,11 @@ def _cut_after_last_breaker(left_context: str) -> str:
     return left_context[last.end():].strip()
 
 
-def _best_trigger_pos(left_context: str, patterns: List[Pattern]) -> Optional[int]:
+def _has_trigger(left_context: str, pattern: Pattern) -> bool:
     """
-    Return the position (end index) of the closest trigger match to entity
-    within left_context, or None.
+    True if any trigger of the category matches within left_context.
     """
-    best = None
-    for pat in patterns:
-        for m in pat.finditer(left_context):
-            # We care about closeness to entity => later match is closer
-            pos = m.end()
-            if best is None or pos > best:
-                best = pos
-    return best
+    return pattern.search(left_context) is not None
 
 
 # ----------------------------
@@ -35,14 +35,8 @@ def load_lexicon_file(filepath: Path, entity_type: str) -> List[Tuple[str, str]]
     if not filepath.exists():
         raise FileNotFoundError(f"Lexicon file not found: {filepath}")
     
-    entries = []
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            term = line.strip()
-            if term:  # Skip empty lines
-                entries.append((term, entity_type))
-    
-    return entries
+    lines = filepath.read_text(encoding='utf-8').splitlines()
+    return [(term, entity_type) for term in map(str.strip, lines) if term]  # Skip empty lines
 
 
 def load_all_lexicons(lexicon_dir: Path | str = None) -> List[Tuple[str, str]]:
@@ -0,0 +1,135 @@
+"""
+Aho-Corasick automaton for multi-term lexicon matching.
+
+Finds every occurrence of every lexicon term in a text with a single pass
+over the text, instead of one substring scan per term. Uses pyahocorasick
+when installed and a small pure-Python automaton with the same
+add_word/make_automaton/iter interface otherwise.
+"""
+from __future__ import annotations
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+try:
+    import ahocorasick
+except ImportError:
+    # Fallback to the pure-Python automaton below
+    ahocorasick = None
+
+
+class PyAutomaton:
+    """
+    Pure-Python Aho-Corasick automaton.
+
+    Mirrors the subset of ``ahocorasick.Automaton`` used here: ``add_word``
+    (last value wins), ``in``, ``len``, ``make_automaton`` and ``iter``,
+    which yields ``(end_index, value)`` for every occurrence, end_index
+    inclusive.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._terminal: List[bool] = [False]
+        self._value: List[Any] = [None]
+        self._dict_link: List[int] = [-1]  # nearest proper suffix holding a value
+        self._size = 0
+
+    def add_word(self, word: str, value: Any) -> bool:
+        if not word:
+            return False
+        node = 0
+        for ch in word:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append(False)
+                self._value.append(None)
+                self._dict_link.append(-1)
+            node = nxt
+        is_new = not self._terminal[node]
+        self._terminal[node] = True
+        self._value[node] = value
+        self._size += is_new
+        return is_new
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, word: str) -> bool:
+        node = 0
+        for ch in word:
+            node = self._goto[node].get(ch)
+            if node is None:
+                return False
+        return self._terminal[node]
+
+    def make_automaton(self) -> None:
+        goto, fail, terminal, dict_link = self._goto, self._fail, self._terminal, self._dict_link
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0) if node else 0
+                fail[child] = target
+                dict_link[child] = target if terminal[target] else dict_link[target]
+                queue.append(child)
+
+    def iter(self, text: str) -> Iterator[Tuple[int, Any]]:
+        goto, fail, terminal, value, dict_link = (
+            self._goto, self._fail, self._terminal, self._value, self._dict_link
+        )
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            out = node if terminal[node] else dict_link[node]
+            while out > 0:
+                yield i, value[out]
+                out = dict_link[out]
+
+
+def new_automaton():
+    """Return an empty automaton, native if pyahocorasick is available."""
+    if ahocorasick is not None:
+        return ahocorasick.Automaton()
+    return PyAutomaton()
+
+
+def build_automaton(keyed_values: Iterable[Tuple[str, Any]]):
+    """
+    Build an automaton from (key, value) pairs.
+
+    Values of repeated keys are grouped into a tuple in input order, so a
+    hit on a key reports every entry that normalizes to it.
+    """
+    grouped: Dict[str, List[Any]] = {}
+    for key, value in keyed_values:
+        if key:
+            grouped.setdefault(key, []).append(value)
+
+    automaton = new_automaton()
+    for key, values in grouped.items():
+        automaton.add_word(key, (key, tuple(values)))
+    if grouped:
+        automaton.make_automaton()
+    return automaton
+
+
+def iter_matches(automaton, text: str) -> Iterator[Tuple[int, int, Tuple[Any, ...]]]:
+    """
+    Yield (start, end, values) for every key occurrence in text, end exclusive.
+
+    Expects an automaton built by build_automaton.
+    """
+    if not len(automaton):
+        return
+    for end_idx, (key, values) in automaton.iter(text):
+        yield end_idx + 1 - len(key), end_idx + 1, values
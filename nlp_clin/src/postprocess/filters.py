@@ -6,7 +6,7 @@ Filters out invalid entity spans based on length, stopwords, and clinical nucleu
 from __future__ import annotations
 import re
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple
 from unidecode import unidecode
 
 
@@ -59,10 +59,13 @@ def normalize_token(token: str) -> str:
     return unidecode(token.lower().strip())
 
 
+_WORD_RE = re.compile(r'\b\w+\b')
+
+
 def tokenize_span(span: str) -> List[str]:
     """Tokenize span by whitespace and punctuation boundaries."""
     # Split on whitespace and punctuation, keep tokens
-    tokens = re.findall(r'\b\w+\b', span.lower())
+    tokens = _WORD_RE.findall(span.lower())
     return tokens
 
 
@@ -91,6 +94,92 @@ def trim_punctuation(text: str, start: int, end: int) -> tuple[int, int]:
     return new_start, new_end
 
 
+def filter_entity(
+    span_text: str,
+    start: Any,
+    end: Any,
+    entity_type: str,
+    raw_text: str,
+    config: FilterConfig
+) -> Optional[Tuple[int, int]]:
+    """
+    Apply the filtering rules to a single entity.
+    
+    Args:
+        span_text: Entity surface text as predicted (may be empty)
+        start, end: Entity offsets in raw_text
+        entity_type: Entity type label
+        raw_text: Original text (for offset validation and trimming)
+        config: FilterConfig
+    
+    Returns:
+        (start, end) of the kept entity, trimmed of punctuation when
+        config.trim_punct is set, or None if the entity is filtered out
+    """
+    # Rule 1: Span integrity
+    if not isinstance(start, int) or not isinstance(end, int):
+        return None  # Skip entities without valid offsets
+    
+    if start < 0 or end > len(raw_text) or end <= start:
+        return None  # Invalid offsets
+    
+    # Extract span from text
+    extracted_span = raw_text[start:end].strip()
+    if not extracted_span:
+        return None  # Empty span
+
+    # Prefer provided span text for filtering semantics when available
+    span_text = span_text.strip()
+    filter_span_pretrim = span_text if span_text else extracted_span
+    
+    # Check if span has at least one alphabetic character
+    if not any(c.isalpha() for c in extracted_span):
+        return None  # Only punctuation/numbers
+    
+    # Rule 3: Trim punctuation (optional)
+    filter_span = span_text or extracted_span
+    if config.trim_punct:
+        new_start, new_end = trim_punctuation(raw_text, start, end)
+        if new_start < new_end and (new_start != start or new_end != end):
+            # Trimmed span replaces the provided text
+            start, end = new_start, new_end
+            filter_span = raw_text[start:end].strip() or raw_text[start:end]
+    
+    # Check if filtering applies to this entity type
+    if config.apply_to_types and entity_type not in config.apply_to_types:
+        # Not filtered beyond integrity checks
+        return start, end
+    
+    # Rule 2: Minimum length (applies only to selected types)
+    if len(filter_span_pretrim) < config.min_chars:
+        return None
+    
+    # Rule 4: Stopword-only spans
+    tokens = tokenize_span(filter_span)
+    if not tokens:
+        return None  # No tokens found
+    
+    # Check if all tokens are stopwords
+    normalized_stopwords = {normalize_token(sw) for sw in config.stopwords}
+    normalized_tokens = {normalize_token(t) for t in tokens}
+    
+    if normalized_tokens.issubset(normalized_stopwords):
+        return None  # All tokens are stopwords
+    
+    # Rule 5: SYMPTOM nucleus constraint
+    if entity_type == "SYMPTOM":
+        normalized_nucleus = {normalize_token(n) for n in config.symptom_nucleus}
+        
+        # Check if any token is in nucleus set
+        has_nucleus = any(normalize_token(t) in normalized_nucleus for t in tokens)
+        
+        if not has_nucleus:
+            return None  # No nucleus token found
+    
+    # Entity passed all filters
+    return start, end
+
+
 def filter_entities(
     entities: List[Dict[str, Any]], 
     raw_text: str, 
@@ -114,80 +203,24 @@ def filter_entities(
     
     for ent in entities:
         # Get entity fields (handle both "span" and "text" keys)
-        span_text = ent.get("span") or ent.get("text", "")
         start = ent.get("start")
         end = ent.get("end")
-        entity_type = ent.get("type", "")
-        
-        # Rule 1: Span integrity
-        if not isinstance(start, int) or not isinstance(end, int):
-            continue  # Skip entities without valid offsets
-        
-        if start < 0 or end > len(raw_text) or end <= start:
-            continue  # Invalid offsets
-        
-        # Extract span from text
-        extracted_span = raw_text[start:end].strip()
-        if not extracted_span:
-            continue  # Empty span
-
-        # Prefer provided span text for filtering semantics when available
-        span_text = (ent.get("span") or ent.get("text") or "").strip()
-        filter_span_pretrim = span_text if span_text else extracted_span
-        
-        # Check if span has at least one alphabetic character
-        if not any(c.isalpha() for c in extracted_span):
-            continue  # Only punctuation/numbers
-        
-        # Rule 3: Trim punctuation (optional)
-        if config.trim_punct:
-            new_start, new_end = trim_punctuation(raw_text, start, end)
-            if new_start < new_end and (new_start != start or new_end != end):
-                # Update entity with trimmed offsets
-                ent = ent.copy()
-                ent["start"] = new_start
-                ent["end"] = new_end
-                ent["span"] = raw_text[new_start:new_end]
-                extracted_span = raw_text[new_start:new_end]
-                start, end = new_start, new_end
-        filter_span = (ent.get("span") or ent.get("text") or "").strip() or extracted_span
-        
-        # Check if filtering applies to this entity type
-        if config.apply_to_types and entity_type not in config.apply_to_types:
-            # Not filtered beyond integrity checks
-            filtered.append(ent)
-            continue
-        
-        # Rule 2: Minimum length (applies only to selected types)
-        if len(filter_span_pretrim) < config.min_chars:
+        kept = filter_entity(
+            ent.get("span") or ent.get("text") or "",
+            start,
+            end,
+            ent.get("type", ""),
+            raw_text,
+            config,
+        )
+        if kept is None:
             continue
         
-        # Rule 4: Stopword-only spans
-        tokens = tokenize_span(filter_span)
-        if not tokens:
-            continue  # No tokens found
-        
-        # Check if all tokens are stopwords
-        normalized_stopwords = {normalize_token(sw) for sw in config.stopwords}
-        normalized_tokens = {normalize_token(t) for t in tokens}
-        
-        if normalized_tokens.issubset(normalized_stopwords):
-            continue  # All tokens are stopwords
-        
-        # Rule 5: SYMPTOM nucleus constraint
-        if entity_type == "SYMPTOM":
-            normalized_nucleus = {normalize_token(n) for n in config.symptom_nucleus}
-            
-            # Check if any token is in nucleus set
-            has_nucleus = any(normalize_token(t) in normalized_nucleus for t in tokens)
-            
-            if not has_nucleus:
-                continue  # No nucleus token found
-        
-        # Entity passed all filters
+        if kept != (start, end):
+            # Update entity with trimmed offsets
+            ent = ent.copy()
+            ent["start"], ent["end"] = kept
+            ent["span"] = raw_text[kept[0]:kept[1]]
         filtered.append(ent)
     
     return filtered
-
-
-
@@ -8,7 +8,7 @@ from src.preprocess import normalize_text
 from src.segment import split_sentences
 from src.baseline_ner import extract_entities_baseline
 from src.context import classify_assertion
-from src.schema import DocOut, EntityOut, LinkCandidate
+from src.schema import DocOut, EntityOut, LinkCandidate, json_default
 from src.postprocess.filters import filter_entities, FilterConfig
 
 
@@ -124,7 +124,7 @@ def run_on_json(json_path: str | Path, out_dir: str | Path) -> None:
         # Write output file
         out_file = out_dir / f"{doc.doc_id}.json"
         out_file.write_text(
-            json.dumps(result, default=lambda o: o.__dict__, ensure_ascii=False, indent=2),
+            json.dumps(result, default=json_default, ensure_ascii=False, indent=2),
             encoding="utf-8"
         )
         print(f"  ✓ {doc.doc_id} -> {out_file}")
@@ -146,7 +146,7 @@ def run_on_json(json_path: str | Path, out_dir: str | Path) -> None:
 #     out_path = Path(out_path)
 #     out_path.parent.mkdir(parents=True, exist_ok=True)
 #     out_path.write_text(
-#         json.dumps(result, default=lambda o: o.__dict__, ensure_ascii=False, indent=2),
+#         json.dumps(result, default=json_default, ensure_ascii=False, indent=2),
 #         encoding="utf-8"
 #     )
 
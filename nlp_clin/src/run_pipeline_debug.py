@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import json
 from dataclasses import asdict
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
 from src.preprocess import normalize_text
-from src.segment import split_sentences
+from src.segment import Sentence, split_sentences_batch
 from src.baseline_ner import extract_entities_baseline
 from src.context import classify_assertion
 from src.postprocess.filters import filter_entities, FilterConfig
@@ -62,11 +62,12 @@ def _build_final_output(text: str, entities_filtered: List[Dict[str, Any]]) -> D
     return asdict(result)
 
 
-def run_pipeline_debug(text: str) -> Dict[str, Any]:
-    raw_text = text or ""
-    preprocessed_text = normalize_text(raw_text)
-
-    sents = split_sentences(preprocessed_text)
+def _run_preprocessed(
+    raw_text: str,
+    preprocessed_text: str,
+    sents: List[Sentence],
+    filter_config: FilterConfig,
+) -> Dict[str, Any]:
     sentences = [{"text": s.text, "start": s.start, "end": s.end} for s in sents]
     sentence_tuples = [(s.text, s.start, s.end) for s in sents]
 
@@ -96,7 +97,6 @@ def run_pipeline_debug(text: str) -> Dict[str, Any]:
             }
         )
 
-    filter_config = FilterConfig()
     entities_after = filter_entities(entities_before, preprocessed_text, filter_config)
     filter_log = _build_filter_log(entities_before, entities_after)
     final_output = _build_final_output(preprocessed_text, entities_after)
@@ -110,3 +110,26 @@ def run_pipeline_debug(text: str) -> Dict[str, Any]:
         "filter_log": filter_log,
         "final_output": final_output,
     }
+
+
+def run_pipeline_debug_batch(texts: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Run the debug pipeline over several texts in one call.
+
+    Sentence splitting goes through spaCy's nlp.pipe and a single FilterConfig
+    is shared, so per-call setup is paid once per batch instead of per text.
+    Results are returned in input order.
+    """
+    raw_texts = [text or "" for text in texts]
+    preprocessed = [normalize_text(raw_text) for raw_text in raw_texts]
+    sentence_lists = split_sentences_batch(preprocessed)
+    filter_config = FilterConfig()
+
+    return [
+        _run_preprocessed(raw_text, preprocessed_text, sents, filter_config)
+        for raw_text, preprocessed_text, sents in zip(raw_texts, preprocessed, sentence_lists)
+    ]
+
+
+def run_pipeline_debug(text: str) -> Dict[str, Any]:
+    return run_pipeline_debug_batch([text])[0]
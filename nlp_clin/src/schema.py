@@ -1,15 +1,15 @@
 from __future__ import annotations
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields, is_dataclass
 from typing import List, Dict, Any, Optional
 
-@dataclass
+@dataclass(slots=True)
 class LinkCandidate:
     system: str
     code: str
     label: str
     score: float
 
-@dataclass
+@dataclass(slots=True)
 class EntityOut:
     span: str
     start: int
@@ -21,7 +21,7 @@ class EntityOut:
     links: List[LinkCandidate]
     icd10: List[Dict[str, Any]]  # deixa flexível no MVP
 
-@dataclass
+@dataclass(slots=True)
 class DocOut:
     doc_id: str
     source: str
@@ -29,3 +29,10 @@ class DocOut:
     entities: List[EntityOut]
     case_id: int
     group: str
+
+
+def json_default(obj: Any) -> Dict[str, Any]:
+    """json.dumps default hook: slotted dataclasses have no __dict__."""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
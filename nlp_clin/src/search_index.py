@@ -1,9 +1,19 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import List, Tuple, Set, Dict
+import hashlib
+import os
+import pickle
 import re
 from unidecode import unidecode
 
+from src import lexicon_automaton
+from src.lexicon_automaton import build_automaton, iter_matches
+
+# Bump when LexiconIndex normalization or layout changes to invalidate caches
+INDEX_CACHE_VERSION = 1
+
 
 @dataclass
 class LexiconEntry:
@@ -22,6 +32,9 @@ class MatchCandidate:
     normalized_term: str
     tokens: List[str]
     match_type: str  # "exact", "token", "fuzzy"
+    # (start, end) of each occurrence in the normalized sentence; exact and
+    # token matches only
+    spans: List[Tuple[int, int]] = field(default_factory=list)
 
 
 class LexiconIndex:
@@ -72,6 +85,12 @@ class LexiconIndex:
                 self.single_token_entries.append(entry)
             else:
                 self.multi_token_entries.append(entry)
+
+        # Phrase lookup for multi-token terms: one pass over the sentence finds
+        # every term that occurs in it as a substring.
+        self._phrase_automaton = build_automaton(
+            (entry.normalized_term, i) for i, entry in enumerate(self.multi_token_entries)
+        )
     
     @staticmethod
     def _normalize(text: str) -> str:
@@ -106,16 +125,25 @@ class LexiconIndex:
         candidates: List[MatchCandidate] = []
         sentence_norm_lower = sentence_norm.lower()
         
+        # Occurrences of the multi-word terms in the sentence, by term
+        phrase_spans: Dict[int, List[Tuple[int, int]]] = {}
+        for start, end, indices in iter_matches(self._phrase_automaton, sentence_norm_lower):
+            for i in indices:
+                phrase_spans.setdefault(i, []).append((start, end))
+        # In lexicon order
+        phrase_hits = sorted(phrase_spans)
+        phrase_entries = [self.multi_token_entries[i] for i in phrase_hits]
+
         # 1. Exact phrase matches (multi-word terms)
-        for entry in self.multi_token_entries:
-            if entry.normalized_term in sentence_norm_lower:
-                candidates.append(MatchCandidate(
-                    term=entry.original_term,
-                    entity_type=entry.entity_type,
-                    normalized_term=entry.normalized_term,
-                    tokens=entry.tokens,
-                    match_type="exact",
-                ))
+        for i, entry in zip(phrase_hits, phrase_entries):
+            candidates.append(MatchCandidate(
+                term=entry.original_term,
+                entity_type=entry.entity_type,
+                normalized_term=entry.normalized_term,
+                tokens=entry.tokens,
+                match_type="exact",
+                spans=sorted(phrase_spans[i]),
+            ))
         
         # 2. Token-based matching
         # For single-token terms: require whole word match
@@ -124,30 +152,31 @@ class LexiconIndex:
             if entry.tokens[0] in sentence_token_set:
                 # Verify it's a whole word in the sentence
                 pattern = r'\b' + re.escape(entry.tokens[0]) + r'\b'
-                if re.search(pattern, sentence_norm_lower):
+                spans = [m.span() for m in re.finditer(pattern, sentence_norm_lower)]
+                if spans:
                     candidates.append(MatchCandidate(
                         term=entry.original_term,
                         entity_type=entry.entity_type,
                         normalized_term=entry.normalized_term,
                         tokens=entry.tokens,
                         match_type="token",
+                        spans=spans,
                     ))
         
-        # For multi-token terms: require all tokens present, then confirm with substring
-        for entry in self.multi_token_entries:
+        # For multi-token terms: require all tokens present in a phrase hit
+        for entry in phrase_entries:
             if all(token in sentence_token_set for token in entry.tokens):
-                # All tokens present, check if they form the phrase
-                if entry.normalized_term in sentence_norm_lower:
-                    # Avoid duplicates from exact match
-                    if not any(c.normalized_term == entry.normalized_term and c.match_type == "exact" 
-                              for c in candidates):
-                        candidates.append(MatchCandidate(
-                            term=entry.original_term,
-                            entity_type=entry.entity_type,
-                            normalized_term=entry.normalized_term,
-                            tokens=entry.tokens,
-                            match_type="token",
-                        ))
+                # All tokens present and the phrase occurs in the sentence.
+                # Avoid duplicates from exact match
+                if not any(c.normalized_term == entry.normalized_term and c.match_type == "exact" 
+                          for c in candidates):
+                    candidates.append(MatchCandidate(
+                        term=entry.original_term,
+                        entity_type=entry.entity_type,
+                        normalized_term=entry.normalized_term,
+                        tokens=entry.tokens,
+                        match_type="token",
+                    ))
         
         return candidates
     
@@ -192,3 +221,38 @@ class LexiconIndex:
         
         return fuzzy_candidates
 
+
+def load_or_build_index(lexicon: List[Tuple[str, str]], cache_dir: Path | str | None = None) -> LexiconIndex:
+    """
+    Return a LexiconIndex for lexicon, reusing a pickled copy when available.
+
+    The cache file is keyed by the lexicon contents, the cache version and
+    the automaton backend, so editing a lexicon file yields a new key. Any
+    failure to read or write the cache falls back to building in memory.
+    """
+    if not cache_dir:
+        return LexiconIndex(lexicon)
+
+    backend = "native" if lexicon_automaton.ahocorasick is not None else "python"
+    key = hashlib.sha1(repr((INDEX_CACHE_VERSION, backend, lexicon)).encode("utf-8")).hexdigest()
+    cache_path = Path(cache_dir) / f"lexicon_index_{key[:16]}.pkl"
+
+    try:
+        with open(cache_path, "rb") as f:
+            index = pickle.load(f)
+        if isinstance(index, LexiconIndex):
+            return index
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        pass
+
+    index = LexiconIndex(lexicon)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent workers never read a partial file
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return index
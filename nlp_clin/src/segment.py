@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
 import spacy
 
 _nlp = spacy.load("pt_core_news_sm", disable=["tagger", "parser", "ner", "lemmatizer"])
@@ -17,8 +17,7 @@ class Sentence:
     end: int
 
 
-def split_sentences(text: str) -> List[Sentence]:
-    doc = _nlp(text)
+def _doc_sentences(doc) -> List[Sentence]:
     out: List[Sentence] = []
     for sent in doc.sents:
         s = sent.text.strip()
@@ -26,3 +25,14 @@ def split_sentences(text: str) -> List[Sentence]:
             continue
         out.append(Sentence(text=s, start=sent.start_char, end=sent.end_char))
     return out
+
+
+def split_sentences(text: str) -> List[Sentence]:
+    return _doc_sentences(_nlp(text))
+
+
+def split_sentences_batch(texts: Iterable[str], batch_size: int = 64,
+                          n_process: int = 1) -> List[List[Sentence]]:
+    """Split many texts at once, letting spaCy batch them through nlp.pipe."""
+    docs = _nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+    return [_doc_sentences(doc) for doc in docs]
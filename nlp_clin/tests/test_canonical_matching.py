@@ -0,0 +1,126 @@
+"""
+Unit tests for canonical lexicon matching helpers.
+"""
+import random
+import re
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# Add nlp_clin/scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from ner_canonical_loader import CanonicalLexiconLoader, find_word_occurrences, is_word_bounded
+
+
+def _regex_occurrences(text, term):
+    pattern = r'\b' + re.escape(term) + r'\b'
+    return [m.span() for m in re.finditer(pattern, text)]
+
+
+def _regex_occurrences_at(text, term, start):
+    pattern = re.compile(r'\b' + re.escape(term) + r'\b')
+    m = pattern.match(text, start)
+    return [m.span()] if m else []
+
+
+class TestFindWordOccurrences(unittest.TestCase):
+    """find_word_occurrences must match the word-boundary regex it replaces."""
+
+    def test_word_boundaries(self):
+        text = "DOR ABDOMINAL, DORES E DOR."
+        self.assertEqual(list(find_word_occurrences(text, "DOR")), [(0, 3), (23, 26)])
+
+    def test_terms_with_punctuation(self):
+        for text, term in [
+            ("HAS (A09) E A09.", "(A09)"),
+            ("PA: 12X8 - PA:", "PA:"),
+            ("_HAS HAS_ HAS", "HAS"),
+            ("AÇÚCAR AÇÚCARES", "AÇÚCAR"),
+        ]:
+            self.assertEqual(
+                list(find_word_occurrences(text, term)),
+                _regex_occurrences(text, term),
+                (text, term),
+            )
+
+    def test_matches_regex_on_random_text(self):
+        rng = random.Random(0)
+        alphabet = "AB ._-(Ç1"
+        for _ in range(500):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            term = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+            self.assertEqual(
+                list(find_word_occurrences(text, term)),
+                _regex_occurrences(text, term),
+                (text, term),
+            )
+
+
+class TestIsWordBounded(unittest.TestCase):
+    """is_word_bounded must agree with the regex on every substring."""
+
+    def test_matches_regex_on_random_text(self):
+        rng = random.Random(1)
+        alphabet = "AB ._-(Ç1"
+        for _ in range(300):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12)))
+            for start in range(len(text)):
+                for end in range(start + 1, len(text) + 1):
+                    term = text[start:end]
+                    expected = (start, end) in _regex_occurrences_at(text, term, start)
+                    self.assertEqual(is_word_bounded(text, start, end), expected, (text, start, end))
+
+
+class TestIndexCache(unittest.TestCase):
+    """A loader restored from the index cache must match like a fresh one."""
+
+    FILES = {
+        "concepts.csv": (
+            "concept_id,concept_name,entity_type,domain,vocabulary,source_file,version,language,status\n"
+            "I10,HIPERTENSAO ESSENCIAL,PROBLEM,problem,CID10,cid.pdf,2021,pt-BR,active\n"
+            "d1,PARACETAMOL 500MG COMPRIMIDO,DRUG,drug,TUSS_DRUG,tuss.csv,2021,pt-BR,active\n"
+        ),
+        "entries.csv": (
+            "entry_text,concept_id,entry_type,match_policy,source_file,language\n"
+            "Hipertensao essencial,I10,official,safe_exact,cid.pdf,pt-BR\n"
+            "I10,I10,code,safe_exact,cid.pdf,pt-BR\n"
+        ),
+        "blocked_terms.csv": "term,reason,source_file\n",
+        "ambiguity.csv": "entry_text,concept_id,conflict_type,possible_meanings,context_rule,source_file\n",
+    }
+
+    def _loader(self, canonical_dir, cache_dir):
+        loader = CanonicalLexiconLoader(cache_dir=cache_dir)
+        loader.canonical_dir = canonical_dir
+        loader.load()
+        return loader
+
+    def test_cached_loader_matches_like_built_one(self):
+        text = "Paciente com hipertensao essencial (I10), usa paracetamol 500mg."
+        with tempfile.TemporaryDirectory() as tmp:
+            canonical_dir = Path(tmp) / "canonical"
+            canonical_dir.mkdir()
+            for name, content in self.FILES.items():
+                (canonical_dir / name).write_text(content, encoding="utf-8")
+            cache_dir = Path(tmp) / "cache"
+
+            built = self._loader(canonical_dir, cache_dir)
+            self.assertEqual(len(list(cache_dir.glob("*.pkl"))), 1)
+            cached = self._loader(canonical_dir, cache_dir)
+
+            self.assertEqual(len(built.match_text(text)), 3)
+            self.assertEqual(cached.match_text(text), built.match_text(text))
+            self.assertEqual(cached.get_stats(), built.get_stats())
+
+            # Changing a canonical file invalidates the cache
+            (canonical_dir / "blocked_terms.csv").write_text(
+                "term,reason,source_file\nI10,test,manual\n", encoding="utf-8"
+            )
+            self._loader(canonical_dir, cache_dir)
+            self.assertEqual(len(list(cache_dir.glob("*.pkl"))), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
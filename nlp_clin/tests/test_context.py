@@ -0,0 +1,50 @@
+"""
+Unit tests for the rule-based assertion classifier.
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from context import (
+    classify_assertion,
+    ASSERTION_PRESENT,
+    ASSERTION_NEGATED,
+    ASSERTION_POSSIBLE,
+    ASSERTION_HISTORICAL,
+)
+
+
+def _classify(sentence, span, ent_type):
+    start = sentence.lower().find(span.lower())
+    return classify_assertion(sentence, start, start + len(span), ent_type)
+
+
+class TestClassifyAssertion(unittest.TestCase):
+    """Test cases for trigger precedence and scope breaking."""
+
+    def test_breaker_ends_negation_scope(self):
+        sentence = "sem perda de consciência, porém refere cefaleia intensa"
+        self.assertEqual(_classify(sentence, "cefaleia", "SYMPTOM"), ASSERTION_PRESENT)
+        self.assertEqual(_classify(sentence, "perda", "SYMPTOM"), ASSERTION_NEGATED)
+
+    def test_anatomy_is_never_negated(self):
+        sentence = "tórax indolor à palpação; sem crepitações"
+        self.assertEqual(_classify(sentence, "crepitações", "SYMPTOM"), ASSERTION_NEGATED)
+        self.assertEqual(_classify(sentence, "tórax", "ANATOMY"), ASSERTION_PRESENT)
+
+    def test_categories(self):
+        self.assertEqual(_classify("Nega   vômitos", "vômitos", "SYMPTOM"), ASSERTION_NEGATED)
+        self.assertEqual(_classify("suspeita de pneumonia", "pneumonia", "PROBLEM"), ASSERTION_POSSIBLE)
+        self.assertEqual(_classify("antecedentes de diabetes mellitus", "diabetes", "PROBLEM"), ASSERTION_HISTORICAL)
+
+    def test_negation_takes_precedence(self):
+        sentence = "história de suspeita de IAM, nega dor"
+        self.assertEqual(_classify(sentence, "dor", "SYMPTOM"), ASSERTION_NEGATED)
+        self.assertEqual(_classify("história de suspeita de IAM", "IAM", "PROBLEM"), ASSERTION_POSSIBLE)
+
+
+if __name__ == '__main__':
+    unittest.main()
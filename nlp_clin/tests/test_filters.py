@@ -10,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from postprocess.filters import (
     filter_entities,
+    filter_entity,
     FilterConfig,
     tokenize_span,
     trim_punctuation,
@@ -171,6 +172,20 @@ class TestFilters(unittest.TestCase):
         self.assertEqual(len(filtered), 1)
         self.assertEqual(filtered[0]["span"], "dor abdominal")
     
+    def test_filter_entity_returns_trimmed_offsets(self):
+        """Test that filter_entity reports trimmed offsets or None."""
+        config = FilterConfig()
+        raw_text = "(febre) e com"
+        self.assertEqual(filter_entity("(febre)", 0, 7, "SYMPTOM", raw_text, config), (1, 6))
+        self.assertEqual(filter_entity("HAS", 0, 3, "PROBLEM", "HAS", config), (0, 3))
+        self.assertIsNone(filter_entity("com", 10, 13, "SYMPTOM", raw_text, config))
+        
+        filtered = filter_entities(
+            [{"span": "(febre)", "start": 0, "end": 7, "type": "SYMPTOM"}], raw_text
+        )
+        self.assertEqual(filtered[0]["span"], "febre")
+        self.assertEqual((filtered[0]["start"], filtered[0]["end"]), (1, 6))
+    
     def test_tokenize_span(self):
         """Test tokenization."""
         tokens = tokenize_span("dor abdominal")
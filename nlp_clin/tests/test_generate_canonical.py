@@ -0,0 +1,52 @@
+"""
+Unit tests for canonical vocabulary generation helpers.
+"""
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add nlp_clin/scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import generate_canonical
+from generate_canonical import ingest_coded_vocabulary, normalize_text
+
+
+class TestNormalizeText(unittest.TestCase):
+    """The clean-string fast path must agree with split/join."""
+
+    def test_empty_values(self):
+        self.assertEqual(normalize_text(None), "")
+        self.assertEqual(normalize_text(""), "")
+        self.assertEqual(normalize_text(" \t "), "")
+
+    def test_matches_split_join(self):
+        rng = random.Random(0)
+        alphabet = "AB \t\n\x1c\xa0　\x85Ç"
+        for _ in range(2000):
+            value = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 8)))
+            self.assertEqual(normalize_text(value), " ".join(value.split()), repr(value))
+
+
+class TestIngestCodedVocabulary(unittest.TestCase):
+    """Short staging rows leave trailing cells empty instead of failing."""
+
+    def test_short_row(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "cid.csv").write_text(
+                "raw_code,raw_name,source,version\nA00,Colera\n", encoding="utf-8"
+            )
+            staging_dir = generate_canonical.STAGING_DIR
+            generate_canonical.STAGING_DIR = Path(tmp)
+            try:
+                part = ingest_coded_vocabulary("cid.csv", "raw_name", "PROBLEM", "problem", "CID10")
+            finally:
+                generate_canonical.STAGING_DIR = staging_dir
+        self.assertEqual(len(part.concepts), 1)
+        self.assertEqual(len(part.entries), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Unit tests for the lexicon Aho-Corasick automaton.
+"""
+import random
+import unittest
+import sys
+from pathlib import Path
+
+# Add nlp_clin to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.lexicon_automaton import PyAutomaton, build_automaton, iter_matches
+
+
+def _naive_matches(keys, text):
+    hits = []
+    for key, values in keys.items():
+        start = text.find(key)
+        while start != -1:
+            hits.append((start, start + len(key), values))
+            start = text.find(key, start + 1)
+    return sorted(hits)
+
+
+class TestLexiconAutomaton(unittest.TestCase):
+    """Test cases for multi-term matching."""
+
+    def test_overlapping_and_nested_terms(self):
+        """Every occurrence is reported, including nested and overlapping terms."""
+        automaton = build_automaton([
+            ("dor", 0),
+            ("dor abdominal", 1),
+            ("abdominal", 2),
+            ("dor", 3),
+        ])
+        hits = sorted(iter_matches(automaton, "dor abdominal e dor"))
+        self.assertEqual(hits, [
+            (0, 3, (0, 3)),
+            (0, 13, (1,)),
+            (4, 13, (2,)),
+            (16, 19, (0, 3)),
+        ])
+
+    def test_empty_automaton(self):
+        """An automaton without keys matches nothing."""
+        self.assertEqual(list(iter_matches(build_automaton([]), "febre")), [])
+
+    def test_pure_python_matches_naive_search(self):
+        """The fallback automaton agrees with repeated str.find."""
+        rng = random.Random(0)
+        keys = {}
+        for _ in range(50):
+            key = "".join(rng.choice("ab ") for _ in range(rng.randint(1, 5)))
+            keys.setdefault(key, (len(keys),))
+        automaton = PyAutomaton()
+        for key, values in keys.items():
+            automaton.add_word(key, (key, values))
+        automaton.make_automaton()
+        for _ in range(20):
+            text = "".join(rng.choice("abc ") for _ in range(60))
+            self.assertEqual(sorted(iter_matches(automaton, text)), _naive_matches(keys, text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+Unit tests for the lexicon loading statistics audit.
+"""
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# Add nlp_clin/audit to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "audit"))
+
+from lexicon_counts import generate_lexicon_counts
+
+
+class TestDeduplicationStats(unittest.TestCase):
+    """Duplicates are counted against the last file that has the term."""
+
+    def test_repeat_within_file_also_in_lower_priority_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            lexicon_dir = Path(tmp)
+            (lexicon_dir / "symptoms_core_ptbr.txt").write_text("febre\nfebre\ntosse\n", encoding="utf-8")
+            (lexicon_dir / "symptoms_expanded_ptbr.txt").write_text("Febre\ncoriza\n", encoding="utf-8")
+            counts = generate_lexicon_counts(lexicon_dir)
+
+        dedup = counts["deduplication"]
+        self.assertEqual(dedup["symptoms_core_ptbr.txt"], {"kept": 3, "skipped": 0})
+        self.assertEqual(dedup["symptoms_expanded_ptbr.txt"], {"kept": 1, "skipped": 2})
+        self.assertEqual(counts["summary"]["total_raw_entries"], 5)
+        self.assertEqual(counts["summary"]["total_loaded_entries"], 3)
+        self.assertEqual(counts["loaded"]["symptoms_core_ptbr.txt"]["entries_loaded"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()